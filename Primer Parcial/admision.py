@@ -0,0 +1,180 @@
+"""
+Control de admisión y descarte de carga
+Middleware ASGI que limita las solicitudes en curso por clase de ruta (lecturas
+baratas y registros costosos por separado). Las solicitudes que superan el
+límite esperan en una cola FIFO con un plazo máximo; si la espera estimada no
+cabe en el plazo se rechazan de inmediato con 503 y Retry-After, de modo que
+algunas solicitudes terminan a tiempo en lugar de vencer todas juntas.
+"""
+
+import asyncio
+import json
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Optional
+
+from models import ErrorResponse
+
+
+class ClaseAdmision:
+    """Límite de concurrencia y cola con plazo para una clase de rutas"""
+
+    def __init__(self, nombre: str, max_en_curso: int, espera_max: float, cola_max: int):
+        self.nombre = nombre
+        self.max_en_curso = max_en_curso
+        self.espera_max = espera_max
+        self.cola_max = cola_max
+        self.en_curso = 0
+        self.admitidas = 0
+        self.rechazadas = 0
+        self.vencidas = 0
+        self.servicio_promedio = 0.0
+        self._cola: Deque[asyncio.Future] = deque()
+
+    @property
+    def en_cola(self) -> int:
+        return len(self._cola)
+
+    def espera_estimada(self) -> float:
+        """Espera estimada para una nueva solicitud, según el tiempo de servicio promedio"""
+        rondas = math.ceil((len(self._cola) + 1) / max(self.max_en_curso, 1))
+        return rondas * self.servicio_promedio
+
+    async def adquirir(self) -> bool:
+        """Obtener un lugar; retorna False si la solicitud debe rechazarse"""
+        if self.en_curso < self.max_en_curso and not self._cola:
+            self.en_curso += 1
+            self.admitidas += 1
+            return True
+
+        # Rechazo temprano: la cola está llena o la espera no cabe en el plazo
+        if len(self._cola) >= self.cola_max or self.espera_estimada() > self.espera_max:
+            self.rechazadas += 1
+            return False
+
+        turno = asyncio.get_running_loop().create_future()
+        self._cola.append(turno)
+        try:
+            await asyncio.wait_for(turno, timeout=self.espera_max)
+        except asyncio.TimeoutError:
+            if turno.done() and not turno.cancelled():
+                self.admitidas += 1
+                return True
+            self.vencidas += 1
+            self.rechazadas += 1
+            return False
+        except asyncio.CancelledError:
+            # El cliente se desconectó; si ya tenía el lugar, se cede al siguiente
+            if turno.done() and not turno.cancelled():
+                self._ceder()
+            raise
+        finally:
+            if turno in self._cola:
+                self._cola.remove(turno)
+
+        # El lugar fue transferido por liberar(), en_curso no cambia
+        self.admitidas += 1
+        return True
+
+    @asynccontextmanager
+    async def lugar(self) -> AsyncIterator[bool]:
+        """Ocupar un lugar fuera del middleware (p. ej. cada usuario de un lote); produce False si se rechaza"""
+        if not await self.adquirir():
+            yield False
+            return
+        inicio = time.perf_counter()
+        try:
+            yield True
+        finally:
+            self.liberar(time.perf_counter() - inicio)
+
+    def liberar(self, duracion: float) -> None:
+        """Liberar un lugar y cederlo al primero en la cola que siga esperando"""
+        self.servicio_promedio = duracion if not self.servicio_promedio else (
+            0.8 * self.servicio_promedio + 0.2 * duracion
+        )
+        self._ceder()
+
+    def _ceder(self) -> None:
+        while self._cola:
+            turno = self._cola.popleft()
+            if not turno.done():
+                turno.set_result(None)
+                return
+        self.en_curso -= 1
+
+    def estadisticas(self) -> Dict[str, Any]:
+        return {
+            "en_curso": self.en_curso,
+            "max_en_curso": self.max_en_curso,
+            "en_cola": self.en_cola,
+            "admitidas": self.admitidas,
+            "rechazadas": self.rechazadas,
+            "vencidas_en_cola": self.vencidas,
+            "servicio_promedio_ms": round(self.servicio_promedio * 1000, 2),
+        }
+
+
+class LimitadorAdmision:
+    """Clases de admisión y la función que asigna cada solicitud a una clase"""
+
+    def __init__(self, clases: Dict[str, ClaseAdmision],
+                 clasificar: Callable[[str, str], Optional[str]]):
+        self.clases = clases
+        self.clasificar = clasificar
+
+    def estadisticas(self) -> Dict[str, Any]:
+        return {nombre: clase.estadisticas() for nombre, clase in self.clases.items()}
+
+
+class MiddlewareAdmision:
+    """Middleware ASGI que aplica el LimitadorAdmision a las solicitudes HTTP"""
+
+    def __init__(self, app, limitador: LimitadorAdmision):
+        self.app = app
+        self.limitador = limitador
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        nombre = self.limitador.clasificar(scope["method"], scope["path"])
+        clase = self.limitador.clases.get(nombre) if nombre else None
+        if clase is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not await clase.adquirir():
+            await self._rechazar(clase, send)
+            return
+
+        inicio = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            clase.liberar(time.perf_counter() - inicio)
+
+    async def _rechazar(self, clase: ClaseAdmision, send) -> None:
+        """Responder 503 con Retry-After en el formato de error estándar"""
+        retry_after = max(1, math.ceil(clase.espera_estimada()))
+        error_response = ErrorResponse(
+            error="Servicio saturado",
+            detalle="Demasiadas solicitudes en curso, intente nuevamente más tarde",
+            codigo_error="HTTP_503",
+            timestamp=datetime.now().isoformat()
+        )
+        cuerpo = json.dumps(error_response.dict(), ensure_ascii=False).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(cuerpo)).encode("ascii")),
+                (b"retry-after", str(retry_after).encode("ascii")),
+            ],
+        })
+        await send({"type": "http.response.body", "body": cuerpo})
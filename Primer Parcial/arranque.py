@@ -0,0 +1,167 @@
+"""
+Arranque rápido de la aplicación
+Carga del esquema OpenAPI precomputado desde disco (ver generar_openapi.py) y
+precalentamiento de recursos costosos en segundo plano, con un estado de
+preparación que expone el endpoint de salud.
+"""
+
+import asyncio
+import hashlib
+import inspect
+import json
+import logging
+import sys
+import sysconfig
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import fastapi
+import pydantic
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+
+logger = logging.getLogger(__name__)
+
+# Clave del archivo con la huella de lo que se usó para generar el esquema (no se sirve)
+CLAVE_HUELLA = "x-huella"
+
+_DIRECTORIOS_EXTERNOS = tuple({sysconfig.get_path(nombre) for nombre in ("stdlib", "platstdlib", "purelib", "platlib")})
+
+
+def modulos_del_esquema(app: FastAPI) -> List[str]:
+    """
+    Archivos fuente del proyecto que definen el esquema: los módulos de los
+    endpoints y de los modelos de sus parámetros y respuestas.
+    """
+    modulos = set()
+    for route in app.routes:
+        if not isinstance(route, APIRoute) or not route.include_in_schema:
+            continue
+        tipos = [route.endpoint, route.response_model]
+        tipos += [parametro.annotation for parametro in inspect.signature(route.endpoint).parameters.values()]
+        modulos.update(getattr(tipo, "__module__", None) for tipo in tipos)
+
+    archivos = {getattr(sys.modules.get(modulo), "__file__", None) for modulo in modulos if modulo}
+    return sorted(archivo for archivo in archivos if archivo and not archivo.startswith(_DIRECTORIOS_EXTERNOS))
+
+
+def huella_openapi(app: FastAPI) -> str:
+    """Huella de las versiones de FastAPI/pydantic, de la aplicación y del código que define el esquema"""
+    huella = hashlib.sha256(f"{fastapi.__version__}|{pydantic.VERSION}|{app.version}".encode("utf-8"))
+    for archivo in modulos_del_esquema(app):
+        with open(archivo, "rb") as fuente:
+            # Independiente de los finales de línea del checkout
+            huella.update(fuente.read().replace(b"\r\n", b"\n"))
+    return huella.hexdigest()
+
+
+def generar_openapi(app: FastAPI) -> Dict[str, Any]:
+    """Generar el esquema con FastAPI, sin usar el precomputado"""
+    guardado = app.openapi_schema
+    app.openapi_schema = None
+    try:
+        return FastAPI.openapi(app)
+    finally:
+        app.openapi_schema = guardado
+
+
+def cargar_openapi(app: FastAPI, ruta: str) -> Optional[Dict[str, Any]]:
+    """
+    Leer el esquema OpenAPI precomputado; retorna None si no existe o si su
+    huella no corresponde a la aplicación (cambiaron endpoints, modelos o versiones).
+    """
+    try:
+        with open(ruta, encoding="utf-8") as archivo:
+            esquema = json.load(archivo)
+    except FileNotFoundError:
+        logger.info(f"No existe el esquema OpenAPI precomputado {ruta}, se generará")
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"No se pudo leer el esquema OpenAPI precomputado {ruta}: {e}")
+        return None
+
+    if esquema.pop(CLAVE_HUELLA, None) != huella_openapi(app):
+        logger.warning(f"El esquema OpenAPI precomputado {ruta} está desactualizado, se generará")
+        return None
+    return esquema
+
+
+def guardar_openapi(app: FastAPI, ruta: str) -> Dict[str, Any]:
+    """Generar el esquema y guardarlo junto con su huella"""
+    esquema = generar_openapi(app)
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        json.dump({**esquema, CLAVE_HUELLA: huella_openapi(app)}, archivo, ensure_ascii=False, indent=2)
+        archivo.write("\n")
+    return esquema
+
+
+def instalar_openapi_precomputado(app: FastAPI, ruta: str) -> None:
+    """
+    Reemplazar app.openapi para que el primer acceso a /openapi.json o /docs lea
+    el esquema de disco en lugar de generarlo. Si el archivo no es válido se usa
+    la generación normal de FastAPI.
+    """
+    def openapi() -> Dict[str, Any]:
+        if app.openapi_schema is None:
+            app.openapi_schema = cargar_openapi(app, ruta) or generar_openapi(app)
+        return app.openapi_schema
+
+    app.openapi = openapi
+
+
+class Precalentamiento:
+    """
+    Tareas de precalentamiento que se ejecutan en segundo plano al arrancar.
+
+    Mientras no se inicie, la aplicación se considera lista (los recursos se
+    crean en el primer uso). Una vez iniciado, queda lista cuando terminan
+    todas las tareas; un fallo se registra y no bloquea la preparación.
+    """
+
+    def __init__(self):
+        self._tareas: Dict[str, Callable[[], Any]] = {}
+        self._estado: Dict[str, str] = {}
+        self._duracion: Dict[str, float] = {}
+        self._pendientes: set = set()
+        self._ejecuciones: set = set()
+
+    def registrar(self, nombre: str, funcion: Callable[[], Any]) -> None:
+        """Registrar una función bloqueante; se ejecuta en un hilo para no frenar el event loop"""
+        self._tareas[nombre] = funcion
+
+    @property
+    def listo(self) -> bool:
+        return not self._pendientes
+
+    def iniciar(self) -> None:
+        """Lanzar todas las tareas registradas sin esperar a que terminen"""
+        for nombre in self._tareas:
+            self._estado[nombre] = "pendiente"
+            self._pendientes.add(nombre)
+            ejecucion = asyncio.ensure_future(self._ejecutar(nombre))
+            self._ejecuciones.add(ejecucion)
+            ejecucion.add_done_callback(self._ejecuciones.discard)
+
+    async def _ejecutar(self, nombre: str) -> None:
+        inicio = time.perf_counter()
+        try:
+            await asyncio.to_thread(self._tareas[nombre])
+            self._estado[nombre] = "completada"
+        except Exception as e:
+            logger.error(f"Falló el precalentamiento de {nombre}: {str(e)}")
+            self._estado[nombre] = "fallida"
+        finally:
+            self._duracion[nombre] = time.perf_counter() - inicio
+            self._pendientes.discard(nombre)
+
+    def estado(self) -> Dict[str, Any]:
+        return {
+            "listo": self.listo,
+            "tareas": {
+                nombre: {
+                    "estado": estado,
+                    "duracion_ms": round(self._duracion[nombre] * 1000, 2) if nombre in self._duracion else None
+                }
+                for nombre, estado in self._estado.items()
+            }
+        }
@@ -0,0 +1,139 @@
+"""
+Autenticación con JWT (HS256)
+Los tokens se firman con HMAC-SHA256 usando la librería estándar. Los tokens ya
+verificados se guardan en una caché LRU acotada que expira junto con el token,
+para no repetir el trabajo de decodificación y firma en cada solicitud.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from config import settings
+
+JWT_HEADER = {"alg": "HS256", "typ": "JWT"}
+
+
+class TokenInvalido(Exception):
+    """El token no es válido, su firma no coincide o ya expiró"""
+
+
+def _b64url_encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64url_decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _firmar(mensaje: bytes) -> bytes:
+    return hmac.new(settings.JWT_SECRET_KEY.encode("utf-8"), mensaje, hashlib.sha256).digest()
+
+
+def crear_token_acceso(user_id: str, email: str, expira_en_minutos: Optional[int] = None) -> Tuple[str, int]:
+    """Crear un token de acceso firmado; retorna el token y su expiración (epoch)"""
+    minutos = expira_en_minutos if expira_en_minutos is not None else settings.ACCESS_TOKEN_EXPIRE_MINUTES
+    ahora = int(time.time())
+    payload = {"sub": user_id, "email": email, "iat": ahora, "exp": ahora + minutos * 60}
+
+    segmentos = [
+        _b64url_encode(json.dumps(JWT_HEADER, separators=(",", ":")).encode("utf-8")),
+        _b64url_encode(json.dumps(payload, separators=(",", ":")).encode("utf-8")),
+    ]
+    firma = _firmar(".".join(segmentos).encode("ascii"))
+    segmentos.append(_b64url_encode(firma))
+    return ".".join(segmentos), payload["exp"]
+
+
+def decodificar_token(token: str) -> Dict[str, Any]:
+    """Decodificar un token verificando algoritmo, firma y expiración"""
+    try:
+        header_b64, payload_b64, firma_b64 = token.split(".")
+        header = json.loads(_b64url_decode(header_b64))
+        if header.get("alg") != settings.JWT_ALGORITHM or settings.JWT_ALGORITHM != "HS256":
+            raise TokenInvalido("Algoritmo de token no soportado")
+
+        esperada = _firmar(f"{header_b64}.{payload_b64}".encode("ascii"))
+        if not hmac.compare_digest(esperada, _b64url_decode(firma_b64)):
+            raise TokenInvalido("Firma del token inválida")
+
+        payload = json.loads(_b64url_decode(payload_b64))
+        exp = int(payload["exp"])
+    except TokenInvalido:
+        raise
+    except (ValueError, KeyError, TypeError, AttributeError):
+        raise TokenInvalido("Token mal formado")
+
+    if exp <= time.time():
+        raise TokenInvalido("Token expirado")
+
+    return payload
+
+
+class TokenCache:
+    """
+    Caché LRU acotada de tokens ya verificados.
+
+    Cada entrada expira junto con su token, por lo que un acierto nunca
+    devuelve un token vencido. Con max_size=0 la caché queda deshabilitada.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.aciertos = 0
+        self.fallos = 0
+        self._entradas: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """Obtener el payload de un token verificado, si sigue vigente"""
+        with self._lock:
+            payload = self._entradas.get(token)
+            if payload is None:
+                self.fallos += 1
+                return None
+            if payload["exp"] <= time.time():
+                del self._entradas[token]
+                self.fallos += 1
+                return None
+            self._entradas.move_to_end(token)
+            self.aciertos += 1
+            return payload
+
+    def set(self, token: str, payload: Dict[str, Any]) -> None:
+        """Guardar un token verificado, expulsando el menos usado si está llena"""
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entradas[token] = payload
+            self._entradas.move_to_end(token)
+            while len(self._entradas) > self.max_size:
+                self._entradas.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entradas.clear()
+            self.aciertos = 0
+            self.fallos = 0
+
+
+token_cache = TokenCache(max_size=settings.JWT_CACHE_MAX_SIZE)
+
+
+def verificar_token(token: str) -> Dict[str, Any]:
+    """Verificar un token pasando primero por la caché de tokens verificados"""
+    payload = token_cache.get(token)
+    if payload is not None:
+        return payload
+
+    payload = decodificar_token(token)
+    token_cache.set(token, payload)
+    return payload
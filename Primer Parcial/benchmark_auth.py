@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark de solicitudes autenticadas con y sin caché de tokens verificados
+Simula varios clientes de dashboard, cada uno reutilizando su token en muchas
+consultas a GET /api/usuarios/{user_id}.
+
+Uso: python benchmark_auth.py [--clientes 50] [--solicitudes 2000] [--concurrencia 32]
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+import httpx
+
+from auth import crear_token_acceso, decodificar_token, verificar_token, token_cache
+from main import app, users_db
+
+
+def preparar_clientes(cantidad: int):
+    """Crear usuarios directamente en el almacenamiento y un token por cliente"""
+    users_db.clear()
+    tokens = []
+    for i in range(cantidad):
+        user_id = str(uuid.uuid4())
+        users_db[user_id] = {
+            "id": user_id, "nombre": "Cliente Dashboard", "email": f"dashboard{i}@ejemplo.com",
+            "edad": 30, "fecha_registro": "2024-01-01T00:00:00"
+        }
+        token, _ = crear_token_acceso(user_id, f"dashboard{i}@ejemplo.com")
+        tokens.append((user_id, token))
+    return tokens
+
+
+async def medir_http(tokens, total: int, concurrencia: int) -> float:
+    """Solicitudes autenticadas por segundo a través de la aplicación ASGI"""
+    semaforo = asyncio.Semaphore(concurrencia)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def una(i):
+            user_id, token = tokens[i % len(tokens)]
+            async with semaforo:
+                response = await client.get(f"/api/usuarios/{user_id}",
+                                            headers={"Authorization": f"Bearer {token}"})
+                assert response.status_code == 200
+
+        inicio = time.perf_counter()
+        await asyncio.gather(*(una(i) for i in range(total)))
+        return total / (time.perf_counter() - inicio)
+
+
+def medir_verificacion(tokens, total: int, funcion) -> float:
+    """Verificaciones de token por segundo, sin la pila HTTP"""
+    inicio = time.perf_counter()
+    for i in range(total):
+        funcion(tokens[i % len(tokens)][1])
+    return total / (time.perf_counter() - inicio)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de la caché de tokens JWT")
+    parser.add_argument("--clientes", type=int, default=50)
+    parser.add_argument("--solicitudes", type=int, default=2000)
+    parser.add_argument("--concurrencia", type=int, default=32)
+    args = parser.parse_args()
+
+    tokens = preparar_clientes(args.clientes)
+    tamano_original = token_cache.max_size
+
+    print(f"clientes: {args.clientes} | solicitudes: {args.solicitudes} | concurrencia: {args.concurrencia}")
+    print(f"{'modo':>10} {'HTTP req/s':>12} {'verificaciones/s':>18}")
+    for modo, tamano in (("sin caché", 0), ("con caché", max(tamano_original, args.clientes))):
+        token_cache.max_size = tamano
+        token_cache.clear()
+        rps = asyncio.run(medir_http(tokens, args.solicitudes, args.concurrencia))
+        funcion = verificar_token if tamano else decodificar_token
+        vps = medir_verificacion(tokens, args.solicitudes * 10, funcion)
+        print(f"{modo:>10} {rps:>12.1f} {vps:>18.1f}")
+
+    token_cache.max_size = tamano_original
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la caché de lectura de usuarios con distribución Zipf
+Simula un almacenamiento persistente con latencia fija por consulta y mide el
+throughput de consultas por ID con y sin caché, la tasa de aciertos y la
+cantidad de consultas que llegan al almacenamiento.
+
+Uso: python benchmark_cache.py [--usuarios 100000] [--consultas 50000] [--zipf 1.1]
+                               [--latencia-ms 0.5] [--fraccion-404 0.2]
+"""
+
+import argparse
+import asyncio
+import itertools
+import random
+import time
+import uuid
+
+from cache import CacheLRU
+from config import settings
+
+
+class AlmacenamientoSimulado:
+    """Almacenamiento asíncrono con latencia fija por consulta (como una base de datos)"""
+
+    def __init__(self, usuarios, latencia: float):
+        self.usuarios = usuarios
+        self.latencia = latencia
+        self.consultas = 0
+
+    async def get(self, user_id):
+        self.consultas += 1
+        await asyncio.sleep(self.latencia)
+        return self.usuarios.get(user_id)
+
+
+def generar_consultas(ids, total: int, s: float, fraccion_404: float, rng: random.Random):
+    """Ids con distribución Zipf de parámetro s, mezclados con ids inexistentes"""
+    pesos = list(itertools.accumulate(1 / (k + 1) ** s for k in range(len(ids))))
+    existentes = rng.choices(ids, cum_weights=pesos, k=total)
+    # Los 404 también se concentran en unos pocos ids (enlaces rotos, scrapers)
+    inexistentes = [f"inexistente-{k}" for k in range(1000)]
+    pesos_404 = list(itertools.accumulate(1 / (k + 1) ** s for k in range(len(inexistentes))))
+    return [
+        rng.choices(inexistentes, cum_weights=pesos_404)[0] if rng.random() < fraccion_404 else user_id
+        for user_id in existentes
+    ]
+
+
+async def medir(consultas, obtener):
+    inicio = time.perf_counter()
+    for user_id in consultas:
+        await obtener(user_id)
+    return len(consultas) / (time.perf_counter() - inicio)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de la caché de lectura de usuarios")
+    parser.add_argument("--usuarios", type=int, default=100_000)
+    parser.add_argument("--consultas", type=int, default=50_000)
+    parser.add_argument("--zipf", type=float, default=1.1)
+    parser.add_argument("--latencia-ms", type=float, default=0.5)
+    parser.add_argument("--fraccion-404", type=float, default=0.2)
+    parser.add_argument("--cache", type=int, default=settings.USUARIOS_CACHE_MAX_SIZE)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    ids = [str(uuid.UUID(int=rng.getrandbits(128))) for _ in range(args.usuarios)]
+    usuarios = {user_id: {"id": user_id} for user_id in ids}
+    consultas = generar_consultas(ids, args.consultas, args.zipf, args.fraccion_404, rng)
+
+    print(f"usuarios: {args.usuarios} | consultas: {args.consultas} | zipf s={args.zipf} | "
+          f"latencia: {args.latencia_ms} ms | 404: {args.fraccion_404:.0%} | caché: {args.cache}")
+    print(f"{'modo':>10} {'consultas/s':>12} {'al almacenamiento':>18} {'tasa aciertos':>14}")
+
+    almacenamiento = AlmacenamientoSimulado(usuarios, args.latencia_ms / 1000)
+    rps = asyncio.run(medir(consultas, almacenamiento.get))
+    print(f"{'sin caché':>10} {rps:>12.0f} {almacenamiento.consultas:>18} {'-':>14}")
+
+    almacenamiento = AlmacenamientoSimulado(usuarios, args.latencia_ms / 1000)
+    cache = CacheLRU(
+        max_size=args.cache,
+        ttl=settings.USUARIOS_CACHE_TTL_SEGUNDOS,
+        max_negativos=settings.USUARIOS_CACHE_MAX_NEGATIVOS,
+        ttl_negativo=settings.USUARIOS_CACHE_TTL_NEGATIVO_SEGUNDOS
+    )
+    rps = asyncio.run(medir(consultas, lambda user_id: cache.obtener(user_id, almacenamiento.get)))
+    tasa = cache.estadisticas()["tasa_aciertos"]
+    print(f"{'con caché':>10} {rps:>12.0f} {almacenamiento.consultas:>18} {tasa:>14.1%}")
+
+
+if __name__ == "__main__":
+    main()
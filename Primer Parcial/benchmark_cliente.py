@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark del cliente de la API frente al patrón de ejemplo_uso.py original
+Compara registros por segundo usando requests.post (una conexión nueva por
+llamada), el cliente síncrono con pool de conexiones y el cliente asíncrono
+con y sin agrupación de registros en lotes.
+
+Si no se indica --url se levanta un servidor uvicorn local para la medición.
+
+Uso: python benchmark_cliente.py [--registros 500] [--concurrencia 8] [--url http://localhost:8000]
+"""
+
+import argparse
+import asyncio
+import socket
+import subprocess
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+
+import httpx
+import requests
+
+from cliente_api import ClienteAPI, ClienteAPIAsync
+
+
+def datos(prefijo: str, i: int):
+    return {"nombre": "Usuario Benchmark", "email": f"{prefijo}{i}@ejemplo.com", "edad": 30}
+
+
+@contextmanager
+def servidor_local():
+    """Levantar uvicorn en un puerto libre y esperar a que responda"""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        puerto = s.getsockname()[1]
+    proceso = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(puerto), "--log-level", "warning"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    url = f"http://127.0.0.1:{puerto}"
+    try:
+        for _ in range(100):
+            try:
+                httpx.get(url)
+                break
+            except httpx.TransportError:
+                time.sleep(0.1)
+        yield url
+    finally:
+        proceso.terminate()
+        proceso.wait()
+
+
+def patron_requests(url: str, total: int, prefijo: str) -> float:
+    """El patrón de ejemplo_uso.py original: requests.post sin sesión"""
+    inicio = time.perf_counter()
+    for i in range(total):
+        requests.post(f"{url}/api/usuarios/registrar", json=datos(prefijo, i),
+                      headers={"Content-Type": "application/json"})
+    return total / (time.perf_counter() - inicio)
+
+
+def cliente_sync(url: str, total: int, prefijo: str) -> float:
+    with ClienteAPI(url) as cliente:
+        inicio = time.perf_counter()
+        for i in range(total):
+            cliente.registrar(**datos(prefijo, i))
+        return total / (time.perf_counter() - inicio)
+
+
+async def cliente_async(url: str, total: int, prefijo: str, concurrencia: int, lote_max: int) -> float:
+    async with ClienteAPIAsync(url, max_concurrencia=concurrencia, lote_max=lote_max) as cliente:
+        inicio = time.perf_counter()
+        await asyncio.gather(*(cliente.registrar(**datos(prefijo, i)) for i in range(total)))
+        return total / (time.perf_counter() - inicio)
+
+
+def medir(url: str, total: int, concurrencia: int):
+    corrida = uuid.uuid4().hex[:8]
+    modos = [
+        ("requests.post (actual)", lambda: patron_requests(url, total, f"req{corrida}-")),
+        ("ClienteAPI (pool)", lambda: cliente_sync(url, total, f"sync{corrida}-")),
+        ("ClienteAPIAsync", lambda: asyncio.run(
+            cliente_async(url, total, f"async{corrida}-", concurrencia, lote_max=1))),
+        ("ClienteAPIAsync + lotes", lambda: asyncio.run(
+            cliente_async(url, total, f"lote{corrida}-", concurrencia, lote_max=50))),
+    ]
+    print(f"registros: {total} | concurrencia async: {concurrencia} | servidor: {url}")
+    print(f"{'modo':>24} {'registros/s':>12}")
+    for nombre, funcion in modos:
+        print(f"{nombre:>24} {funcion():>12.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del cliente de la API")
+    parser.add_argument("--registros", type=int, default=500)
+    parser.add_argument("--concurrencia", type=int, default=8)
+    parser.add_argument("--url", default=None)
+    args = parser.parse_args()
+
+    if args.url:
+        medir(args.url, args.registros, args.concurrencia)
+    else:
+        with servidor_local() as url:
+            medir(url, args.registros, args.concurrencia)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark de registro e inicio de sesión con contraseña
+Mide el throughput (solicitudes por segundo) variando el número de workers del
+pool de procesos que calcula los hashes scrypt.
+
+Uso: python benchmark_password.py [--solicitudes 64] [--concurrencia 16] [--workers 1 2 4]
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+import httpx
+
+from main import app, users_db, usuarios_por_email, passwords_db
+from security import password_hasher
+
+PASSWORD = "Benchmark#2024"
+
+
+async def ejecutar_concurrente(total: int, concurrencia: int, crear_solicitud):
+    """Ejecutar `total` solicitudes con a lo sumo `concurrencia` simultáneas"""
+    semaforo = asyncio.Semaphore(concurrencia)
+    codigos = []
+
+    async def una(i):
+        async with semaforo:
+            response = await crear_solicitud(i)
+            codigos.append(response.status_code)
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(una(i) for i in range(total)))
+    return time.perf_counter() - inicio, codigos
+
+
+async def medir(workers: int, total: int, concurrencia: int):
+    """Medir registro y login para un tamaño de pool dado"""
+    users_db.clear()
+    usuarios_por_email.clear()
+    passwords_db.clear()
+    password_hasher.reconfigurar(workers, max_pendientes=max(concurrencia, workers * 4))
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # Calentar el pool para no medir el arranque de los procesos
+        await client.post("/api/usuarios/registrar", json={
+            "nombre": "Calentamiento Pool", "email": "warmup@ejemplo.com",
+            "edad": 30, "password": PASSWORD
+        })
+
+        def registrar(i):
+            return client.post("/api/usuarios/registrar", json={
+                "nombre": "Usuario Benchmark", "email": f"bench{i}@ejemplo.com",
+                "edad": 30, "password": PASSWORD
+            })
+
+        def login(i):
+            return client.post("/api/usuarios/login", json={
+                "email": f"bench{i}@ejemplo.com", "password": PASSWORD
+            })
+
+        t_registro, codigos_registro = await ejecutar_concurrente(total, concurrencia, registrar)
+        t_login, codigos_login = await ejecutar_concurrente(total, concurrencia, login)
+
+    password_hasher.shutdown()
+    return {
+        "registro_rps": total / t_registro,
+        "login_rps": total / t_login,
+        "registro_rechazos": codigos_registro.count(503),
+        "login_rechazos": codigos_login.count(503),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de hashing de contraseñas")
+    parser.add_argument("--solicitudes", type=int, default=64)
+    parser.add_argument("--concurrencia", type=int, default=16)
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    args = parser.parse_args()
+
+    print(f"CPUs: {os.cpu_count()} | solicitudes: {args.solicitudes} | concurrencia: {args.concurrencia}")
+    print(f"{'workers':>8} {'registro req/s':>15} {'login req/s':>12} {'503 reg':>8} {'503 login':>10}")
+    for workers in args.workers:
+        r = asyncio.run(medir(workers, args.solicitudes, args.concurrencia))
+        print(f"{workers:>8} {r['registro_rps']:>15.1f} {r['login_rps']:>12.1f} "
+              f"{r['registro_rechazos']:>8} {r['login_rechazos']:>10}")
+
+
+if __name__ == "__main__":
+    main()
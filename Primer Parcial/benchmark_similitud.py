@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Benchmark del índice de trigramas para nombres casi duplicados
+Construye un índice con nombres sintéticos (vocabulario con cola larga y
+frecuencias tipo Zipf) y mide la latencia de búsqueda y el recall para
+variantes con mayúsculas/espacios y con un carácter eliminado, y la latencia de
+la verificación del registro (limite=1) con nombres existentes y nuevos.
+
+Uso: python benchmark_similitud.py [--usuarios 1000000] [--consultas 500] [--umbral 0.6]
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from config import settings
+from similitud import IndiceTrigramas, normalizar_nombre
+
+SILABAS = [
+    "ma", "ri", "jo", "se", "an", "lu", "ca", "ro", "pe", "dro", "gon", "za", "lez", "mar",
+    "tin", "rez", "gar", "cía", "lo", "pez", "her", "nán", "dez", "fer", "ra", "mi", "to",
+    "va", "gas", "cas", "ti", "llo", "al", "ba", "bre", "cho", "dia", "es", "qui", "fu",
+    "ren", "gil", "mo", "ya", "ne", "zu", "ñi", "ga", "sal", "ve", "ru", "iz", "ol", "me", "du",
+]
+
+
+def vocabulario(rng: random.Random, cantidad: int, silabas) -> list:
+    palabras = set()
+    while len(palabras) < cantidad:
+        palabras.add("".join(rng.choice(SILABAS) for _ in range(rng.choice(silabas))).capitalize())
+    return sorted(palabras)
+
+
+def generar_nombres(rng: random.Random, cantidad: int) -> list:
+    """Nombres de pila y apellidos con frecuencias tipo Zipf"""
+    nombres = vocabulario(rng, 1500, (2, 3))
+    apellidos = vocabulario(rng, 20000, (2, 3, 3, 4))
+    pesos_nombres = [1 / (i + 1) for i in range(len(nombres))]
+    pesos_apellidos = [1 / (i + 1) ** 0.9 for i in range(len(apellidos))]
+    pila = rng.choices(nombres, pesos_nombres, k=cantidad * 2)
+    familia = rng.choices(apellidos, pesos_apellidos, k=cantidad * 2)
+
+    resultado = []
+    for i in range(cantidad):
+        partes = [pila[i]] + ([pila[cantidad + i]] if i % 3 == 0 else [])
+        partes += [familia[i], familia[cantidad + i]]
+        resultado.append(" ".join(partes))
+    return resultado
+
+
+def medir(indice, consultas, umbral):
+    """Latencias (ms) y recall: el usuario original debe aparecer en los resultados"""
+    latencias = []
+    encontrados = 0
+    for user_id, consulta in consultas:
+        inicio = time.perf_counter()
+        resultados = indice.buscar(consulta, umbral=umbral, limite=1000)
+        latencias.append((time.perf_counter() - inicio) * 1000)
+        encontrados += any(r[0] == user_id for r in resultados)
+    latencias.sort()
+    return latencias, encontrados / len(consultas)
+
+
+def medir_registro(indice, nombres, umbral):
+    """Latencias (ms) de la verificación que hace el registro: ¿existe algún nombre similar?"""
+    latencias = []
+    for nombre in nombres:
+        inicio = time.perf_counter()
+        indice.buscar(nombre, umbral=umbral, limite=1)
+        latencias.append((time.perf_counter() - inicio) * 1000)
+    latencias.sort()
+    return latencias
+
+
+def imprimir(tipo, latencias, recall=None):
+    linea = (f"{tipo:>26}: media {statistics.mean(latencias):.2f} ms | "
+             f"p50 {latencias[len(latencias) // 2]:.2f} ms | "
+             f"p99 {latencias[int(len(latencias) * 0.99)]:.2f} ms")
+    print(linea if recall is None else f"{linea} | recall {recall:.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del índice de trigramas")
+    parser.add_argument("--usuarios", type=int, default=1_000_000)
+    parser.add_argument("--consultas", type=int, default=500)
+    parser.add_argument("--umbral", type=float, default=0.6)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    nombres = generar_nombres(rng, args.usuarios)
+    indice = IndiceTrigramas()
+
+    inicio = time.perf_counter()
+    for i, nombre in enumerate(nombres):
+        indice.agregar(f"user-{i}", nombre)
+    construccion = time.perf_counter() - inicio
+
+    muestra = rng.sample(range(args.usuarios), args.consultas)
+    variantes = {
+        "mayúsculas/espacios": [
+            (f"user-{i}", rng.choice([nombres[i].upper(), nombres[i].replace(" ", "  ")]))
+            for i in muestra
+        ],
+        "un carácter menos": [],
+    }
+    for i in muestra:
+        nombre = normalizar_nombre(nombres[i])
+        pos = rng.randrange(len(nombre))
+        variantes["un carácter menos"].append((f"user-{i}", nombre[:pos] + nombre[pos + 1:]))
+
+    print(f"usuarios: {args.usuarios} | consultas: {args.consultas} | umbral: {args.umbral}")
+    print(f"construcción del índice: {construccion:.1f} s")
+    for tipo, consultas in variantes.items():
+        latencias, recall = medir(indice, consultas, args.umbral)
+        imprimir(tipo, latencias, recall)
+
+    umbral_registro = settings.NOMBRE_SIMILITUD_UMBRAL
+    nuevos = generar_nombres(random.Random(7), args.consultas)
+    imprimir(f"registro existente ({umbral_registro})",
+             medir_registro(indice, [nombres[i] for i in muestra], umbral_registro))
+    imprimir(f"registro nuevo ({umbral_registro})", medir_registro(indice, nuevos, umbral_registro))
+
+
+if __name__ == "__main__":
+    main()
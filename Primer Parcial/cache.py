@@ -0,0 +1,167 @@
+"""
+Caché de lectura (read-through) para consultas de usuarios
+Caché LRU acotada por tamaño y TTL delante del almacenamiento. También guarda
+resultados negativos (ids inexistentes) en una partición propia con su propio
+límite, para que el tráfico de 404 no expulse a las entradas más consultadas.
+El cargador puede ser asíncrono: los fallos concurrentes de una misma clave
+comparten una sola carga, y una invalidación mientras se carga impide guardar
+el resultado (posiblemente viejo) de esa carga.
+"""
+
+import asyncio
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple, Union
+
+
+class CacheLRU:
+    """
+    Caché LRU read-through con TTL, caché negativa e invalidación.
+
+    `obtener` consulta la caché y, si no hay entrada vigente, llama al
+    cargador (por ejemplo una consulta a la base de datos) y guarda el
+    resultado. Un resultado None se guarda como entrada negativa.
+
+    Con un cargador asíncrono, la carga en curso de cada clave se registra y
+    los fallos concurrentes de esa clave la esperan en lugar de consultar de
+    nuevo al almacenamiento. `invalidar` la desvincula: las consultas
+    siguientes inician otra carga y la desvinculada no guarda su resultado.
+    """
+
+    def __init__(self, max_size: int, ttl: float, max_negativos: int = 0, ttl_negativo: float = 0.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.max_negativos = max_negativos
+        self.ttl_negativo = ttl_negativo
+        self.aciertos = 0
+        self.aciertos_negativos = 0
+        self.fallos = 0
+        self.invalidaciones = 0
+        self.cargas_compartidas = 0
+        self._entradas: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._negativos: "OrderedDict[Hashable, float]" = OrderedDict()
+        # Carga asíncrona vigente de cada clave que se está cargando
+        self._cargas: "Dict[Hashable, asyncio.Future]" = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entradas) + len(self._negativos)
+
+    def _buscar(self, clave: Hashable) -> Tuple[bool, Any]:
+        """Buscar una entrada vigente; retorna (encontrada, valor)"""
+        ahora = time.monotonic()
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is not None:
+                if entrada[0] > ahora:
+                    self._entradas.move_to_end(clave)
+                    self.aciertos += 1
+                    return True, entrada[1]
+                del self._entradas[clave]
+
+            expira = self._negativos.get(clave)
+            if expira is not None:
+                if expira > ahora:
+                    self._negativos.move_to_end(clave)
+                    self.aciertos_negativos += 1
+                    return True, None
+                del self._negativos[clave]
+
+            self.fallos += 1
+            return False, None
+
+    def _terminar_carga(self, clave: Hashable, carga: "asyncio.Future") -> None:
+        """Guardar el resultado si la carga sigue vigente (la clave no se invalidó mientras tanto)"""
+        # Consultar la excepción la marca como recuperada aunque nadie espere la carga
+        fallida = carga.cancelled() or carga.exception() is not None
+        with self._lock:
+            if self._cargas.get(clave) is not carga:
+                return
+            del self._cargas[clave]
+            if not fallida:
+                self._guardar(clave, carga.result())
+
+    def _guardar(self, clave: Hashable, valor: Any) -> None:
+        """Guardar un valor; se llama con el lock tomado"""
+        ahora = time.monotonic()
+        if valor is None:
+            if self.max_negativos <= 0:
+                return
+            self._negativos[clave] = ahora + self.ttl_negativo
+            self._negativos.move_to_end(clave)
+            while len(self._negativos) > self.max_negativos:
+                self._negativos.popitem(last=False)
+        else:
+            if self.max_size <= 0:
+                return
+            self._entradas[clave] = (ahora + self.ttl, valor)
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.max_size:
+                self._entradas.popitem(last=False)
+
+    async def obtener(
+        self,
+        clave: Hashable,
+        cargar: Callable[[Hashable], Union[Optional[Any], Awaitable[Optional[Any]]]]
+    ) -> Optional[Any]:
+        """
+        Obtener un valor de la caché o cargarlo del almacenamiento si no está.
+        El cargador puede retornar el valor o un awaitable (consulta asíncrona).
+        """
+        encontrada, valor = self._buscar(clave)
+        if encontrada:
+            return valor
+
+        with self._lock:
+            carga = self._cargas.get(clave)
+            if carga is not None:
+                self.cargas_compartidas += 1
+        if carga is None:
+            valor = cargar(clave)
+            if not inspect.isawaitable(valor):
+                # Cargador síncrono: no hay espera en la que otra consulta pueda intervenir
+                with self._lock:
+                    self._guardar(clave, valor)
+                return valor
+            carga = asyncio.ensure_future(valor)
+            with self._lock:
+                self._cargas[clave] = carga
+            carga.add_done_callback(functools.partial(self._terminar_carga, clave))
+        # shield: si se cancela quien espera, la carga sigue para las demás consultas
+        return await asyncio.shield(carga)
+
+    def invalidar(self, clave: Hashable) -> None:
+        """Eliminar una clave (positiva o negativa) tras una escritura"""
+        with self._lock:
+            self._entradas.pop(clave, None)
+            self._negativos.pop(clave, None)
+            self._cargas.pop(clave, None)
+            self.invalidaciones += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entradas.clear()
+            self._negativos.clear()
+            self._cargas.clear()
+            self.aciertos = 0
+            self.aciertos_negativos = 0
+            self.fallos = 0
+            self.invalidaciones = 0
+            self.cargas_compartidas = 0
+
+    def estadisticas(self) -> Dict[str, Any]:
+        """Contadores de aciertos y fallos y tamaño actual de la caché"""
+        consultas = self.aciertos + self.aciertos_negativos + self.fallos
+        return {
+            "aciertos": self.aciertos,
+            "aciertos_negativos": self.aciertos_negativos,
+            "fallos": self.fallos,
+            "invalidaciones": self.invalidaciones,
+            "cargas_compartidas": self.cargas_compartidas,
+            "tasa_aciertos": round((self.aciertos + self.aciertos_negativos) / consultas, 4) if consultas else 0.0,
+            "entradas": len(self._entradas),
+            "entradas_negativas": len(self._negativos),
+        }
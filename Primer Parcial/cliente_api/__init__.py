@@ -0,0 +1,26 @@
+"""
+Cliente Python de la API de Validación de Usuarios
+Clientes síncrono y asíncrono con pool de conexiones persistentes, timeouts,
+reintentos con jitter ante 429/503 y resultados tipados con los modelos de
+cliente_api.esquemas (que la aplicación también usa para sus respuestas).
+"""
+
+import importlib
+from typing import Any
+
+# Los clientes se cargan en el primer acceso: así la aplicación puede importar
+# cliente_api.esquemas sin requerir httpx
+_EXPORTADOS = {
+    "ClienteAPI": ".sync",
+    "ClienteAPIAsync": ".asincrono",
+    "ErrorAPI": ".base",
+    "datos_registro": ".base",
+}
+
+__all__ = list(_EXPORTADOS)
+
+
+def __getattr__(nombre: str) -> Any:
+    if nombre not in _EXPORTADOS:
+        raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
+    return getattr(importlib.import_module(_EXPORTADOS[nombre], __name__), nombre)
@@ -0,0 +1,204 @@
+"""
+Cliente asíncrono de la API de Validación de Usuarios
+Usa un httpx.AsyncClient con pool de conexiones persistentes, concurrencia
+acotada, reintentos con jitter ante 429/503 y agrupación automática de
+registros concurrentes en solicitudes al endpoint de lotes.
+"""
+
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import httpx
+
+from .esquemas import RegistroLoteResponse, TokenResponse, UserResponse, Usuario
+from . import base
+
+
+class ClienteAPIAsync:
+    """
+    Cliente asíncrono para todos los endpoints de la API.
+
+    Con `lote_max > 1`, las llamadas concurrentes a `registrar` se agrupan
+    durante `lote_espera` segundos (o hasta juntar `lote_max`) y se envían en
+    una sola solicitud al endpoint de lotes. Si el servidor no tiene ese
+    endpoint se vuelve al registro individual.
+
+        async with ClienteAPIAsync("http://localhost:8000") as cliente:
+            usuarios = await asyncio.gather(*(cliente.registrar(...) for ...))
+    """
+
+    def __init__(self, base_url: str = "http://localhost:8000", timeout: float = 10.0,
+                 max_concurrencia: int = 10, max_reintentos: int = 3,
+                 espera_base: float = 0.1, espera_max: float = 5.0,
+                 lote_max: int = 50, lote_espera: float = 0.005,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.max_concurrencia = max_concurrencia
+        self.max_reintentos = max_reintentos
+        self.espera_base = espera_base
+        self.espera_max = espera_max
+        self.lote_max = lote_max
+        self.lote_espera = lote_espera
+        self.lote_disponible = lote_max > 1
+        self._token: Optional[str] = None
+        self._semaforo: Optional[asyncio.Semaphore] = None
+        self._pendientes: List[Tuple[Dict[str, Any], asyncio.Future]] = []
+        self._envio_agendado: Optional[asyncio.TimerHandle] = None
+        self._envios: set = set()
+        self._http = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_concurrencia, max_keepalive_connections=max_concurrencia),
+            transport=transport
+        )
+
+    async def __aenter__(self) -> "ClienteAPIAsync":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Enviar los registros pendientes y cerrar el pool de conexiones"""
+        if self._pendientes:
+            self._enviar_pendientes()
+        if self._envios:
+            await asyncio.gather(*self._envios, return_exceptions=True)
+        await self._http.aclose()
+
+    def _headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self._token}"} if self._token else {}
+
+    async def _solicitud(self, metodo: str, ruta: str, **kwargs) -> httpx.Response:
+        """Enviar una solicitud con concurrencia acotada, reintentando ante 429/503"""
+        if self._semaforo is None:
+            self._semaforo = asyncio.Semaphore(self.max_concurrencia)
+        for intento in range(self.max_reintentos + 1):
+            async with self._semaforo:
+                response = await self._http.request(metodo, ruta, headers=self._headers(), **kwargs)
+            if response.status_code not in base.ESTADOS_REINTENTABLES or intento == self.max_reintentos:
+                return base.verificar_respuesta(response)
+            await asyncio.sleep(base.calcular_espera(intento, response, self.espera_base, self.espera_max))
+        raise AssertionError("inalcanzable")
+
+    async def _registrar_individual(self, datos: Dict[str, Any]) -> UserResponse:
+        return base.registro_desde_json((await self._solicitud("POST", base.RUTA_REGISTRO, json=datos)).json())
+
+    async def registrar(self, nombre: str, email: str, edad: int, password: Optional[str] = None) -> UserResponse:
+        datos = base.datos_registro(nombre, email, edad, password)
+        if not self.lote_disponible:
+            return await self._registrar_individual(datos)
+
+        loop = asyncio.get_running_loop()
+        futuro = loop.create_future()
+        self._pendientes.append((datos, futuro))
+        if len(self._pendientes) >= self.lote_max:
+            self._enviar_pendientes()
+        elif self._envio_agendado is None:
+            self._envio_agendado = loop.call_later(self.lote_espera, self._enviar_pendientes)
+        return await futuro
+
+    def _enviar_pendientes(self) -> None:
+        if self._envio_agendado is not None:
+            self._envio_agendado.cancel()
+            self._envio_agendado = None
+        lote, self._pendientes = self._pendientes, []
+        if lote:
+            tarea = asyncio.ensure_future(self._enviar_lote(lote))
+            self._envios.add(tarea)
+            tarea.add_done_callback(self._envios.discard)
+
+    async def _enviar_lote(self, lote: List[Tuple[Dict[str, Any], asyncio.Future]]) -> None:
+        """Enviar un lote y resolver el futuro de cada registro con su resultado"""
+        try:
+            if len(lote) == 1 or not self.lote_disponible:
+                await self._resolver_individuales(lote)
+                return
+            try:
+                response = await self._solicitud("POST", base.RUTA_REGISTRO_LOTE, json=[d for d, _ in lote])
+            except base.ErrorAPI as e:
+                if e.status_code in (404, 405):
+                    # El servidor no tiene endpoint de lotes
+                    self.lote_disponible = False
+                    await self._resolver_individuales(lote)
+                    return
+                raise
+
+            resultados = base.lote_desde_json(response.json()).resultados
+            reintentar = []
+            for (datos, futuro), resultado in zip(lote, resultados):
+                # El llamador pudo cancelarse (por ejemplo con wait_for) mientras se enviaba el lote
+                if futuro.done():
+                    continue
+                if resultado.estado in base.ESTADOS_REINTENTABLES:
+                    reintentar.append((datos, futuro))
+                elif resultado.usuario is not None:
+                    futuro.set_result(resultado.usuario)
+                else:
+                    futuro.set_exception(base.ErrorAPI(resultado.estado, resultado.error))
+            for _, futuro in lote[len(resultados):]:
+                if not futuro.done():
+                    futuro.set_exception(RuntimeError(
+                        f"El servidor retornó {len(resultados)} resultados para un lote de {len(lote)} registros"
+                    ))
+            # Los registros rechazados por saturación se reintentan de forma individual
+            await self._resolver_individuales(reintentar)
+        except Exception as e:
+            for _, futuro in lote:
+                if not futuro.done():
+                    futuro.set_exception(e)
+
+    async def _resolver_individuales(self, lote: List[Tuple[Dict[str, Any], asyncio.Future]]) -> None:
+        async def uno(datos, futuro):
+            if futuro.done():
+                return
+            try:
+                usuario = await self._registrar_individual(datos)
+            except Exception as e:
+                if not futuro.done():
+                    futuro.set_exception(e)
+            else:
+                if not futuro.done():
+                    futuro.set_result(usuario)
+        await asyncio.gather(*(uno(datos, futuro) for datos, futuro in lote))
+
+    async def registrar_lote(self, usuarios: List[Dict[str, Any]]) -> RegistroLoteResponse:
+        """Registrar varios usuarios en una sola solicitud (ver base.datos_registro)"""
+        return base.lote_desde_json((await self._solicitud("POST", base.RUTA_REGISTRO_LOTE, json=usuarios)).json())
+
+    async def login(self, email: str, password: str) -> TokenResponse:
+        """Iniciar sesión; el token se usa en las siguientes solicitudes del cliente"""
+        response = await self._solicitud("POST", base.RUTA_LOGIN, json={"email": email, "password": password})
+        token = base.token_desde_json(response.json())
+        self._token = token.access_token
+        return token
+
+    async def listar_usuarios(self) -> List[Usuario]:
+        return base.usuarios_desde_json((await self._solicitud("GET", base.RUTA_USUARIOS)).json())
+
+    async def obtener_usuario(self, user_id: str) -> Usuario:
+        return base.usuario_desde_json((await self._solicitud("GET", f"{base.RUTA_USUARIOS}/{user_id}")).json())
+
+    async def buscar_similares(self, nombre: str, umbral: float = 0.6,
+                               limite: int = 10) -> List[Tuple[Usuario, float]]:
+        params = {"nombre": nombre, "umbral": umbral, "limite": limite}
+        return base.similares_desde_json((await self._solicitud("GET", base.RUTA_SIMILARES, params=params)).json())
+
+    async def metricas(self) -> Dict[str, Any]:
+        return (await self._solicitud("GET", base.RUTA_METRICAS)).json()
+
+    async def info(self) -> Dict[str, Any]:
+        return (await self._solicitud("GET", "/")).json()
+
+    async def eventos(self, ultimo_id: Optional[str] = None) -> AsyncIterator[Tuple[Optional[str], str, Any]]:
+        """Iterar el feed de registros; cada evento es (id, tipo, datos)"""
+        headers = self._headers()
+        if ultimo_id is not None:
+            headers["Last-Event-ID"] = ultimo_id
+        parser = base.ParserSSE()
+        async with self._http.stream("GET", base.RUTA_EVENTOS, headers=headers, timeout=None) as response:
+            if response.status_code >= 400:
+                await response.aread()
+            base.verificar_respuesta(response)
+            async for linea in response.aiter_lines():
+                for evento in parser.procesar(linea):
+                    yield evento
@@ -0,0 +1,120 @@
+"""
+Piezas comunes de los clientes síncrono y asíncrono
+Construcción de solicitudes, política de reintentos y conversión de las
+respuestas a los modelos de esquemas.py del paquete.
+"""
+
+import json
+import random
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import httpx
+
+from .esquemas import ErrorResponse, RegistroLoteResponse, TokenResponse, UserResponse, Usuario
+
+RUTA_REGISTRO = "/api/usuarios/registrar"
+RUTA_REGISTRO_LOTE = "/api/usuarios/registrar/lote"
+RUTA_LOGIN = "/api/usuarios/login"
+RUTA_USUARIOS = "/api/usuarios"
+RUTA_SIMILARES = "/api/usuarios/similares"
+RUTA_EVENTOS = "/api/usuarios/eventos"
+RUTA_METRICAS = "/api/metricas"
+
+ESTADOS_REINTENTABLES = (429, 503)
+
+
+class ErrorAPI(Exception):
+    """Respuesta de error de la API, con el ErrorResponse estándar si está disponible"""
+
+    def __init__(self, status_code: int, error: Optional[ErrorResponse] = None):
+        self.status_code = status_code
+        self.error = error
+        super().__init__(f"HTTP {status_code}: {error.error if error else 'sin detalle'}")
+
+
+def error_desde_respuesta(response: httpx.Response) -> ErrorAPI:
+    try:
+        return ErrorAPI(response.status_code, ErrorResponse(**response.json()))
+    except (ValueError, TypeError):
+        return ErrorAPI(response.status_code)
+
+
+def verificar_respuesta(response: httpx.Response) -> httpx.Response:
+    """Lanzar ErrorAPI si la respuesta no es exitosa"""
+    if response.status_code >= 400:
+        raise error_desde_respuesta(response)
+    return response
+
+
+def calcular_espera(intento: int, response: Optional[httpx.Response], base: float, maximo: float) -> float:
+    """
+    Espera antes de reintentar: respeta Retry-After si el servidor lo envía y si no
+    usa backoff exponencial con jitter completo para no reintentar todos a la vez.
+    """
+    if response is not None:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), maximo) * random.uniform(1.0, 1.5)
+    return random.uniform(0, min(maximo, base * 2 ** intento))
+
+
+def registro_desde_json(datos: Dict[str, Any]) -> UserResponse:
+    return UserResponse(**datos)
+
+
+def usuario_desde_json(datos: Dict[str, Any]) -> Usuario:
+    return Usuario(**datos)
+
+
+def usuarios_desde_json(datos: Dict[str, Any]) -> List[Usuario]:
+    return [Usuario(**usuario) for usuario in datos["usuarios"]]
+
+
+def similares_desde_json(datos: Dict[str, Any]) -> List[Tuple[Usuario, float]]:
+    return [(Usuario(**usuario), usuario["similitud"]) for usuario in datos["similares"]]
+
+
+def token_desde_json(datos: Dict[str, Any]) -> TokenResponse:
+    return TokenResponse(**datos)
+
+
+def lote_desde_json(datos: Dict[str, Any]) -> RegistroLoteResponse:
+    return RegistroLoteResponse(**datos)
+
+
+def datos_registro(nombre: str, email: str, edad: int, password: Optional[str] = None) -> Dict[str, Any]:
+    datos: Dict[str, Any] = {"nombre": nombre, "email": email, "edad": edad}
+    if password is not None:
+        datos["password"] = password
+    return datos
+
+
+class ParserSSE:
+    """Convierte las líneas de un stream text/event-stream en eventos (id, tipo, datos)"""
+
+    def __init__(self):
+        self._id: Optional[str] = None
+        self._tipo: Optional[str] = None
+        self._datos: List[str] = []
+
+    def procesar(self, linea: str) -> Iterator[Tuple[Optional[str], str, Any]]:
+        if linea == "":
+            if self._datos:
+                datos = "\n".join(self._datos)
+                try:
+                    datos = json.loads(datos)
+                except ValueError:
+                    pass
+                yield self._id, self._tipo or "message", datos
+            self._id, self._tipo, self._datos = None, None, []
+        elif linea.startswith(":"):
+            return
+        else:
+            campo, _, valor = linea.partition(":")
+            valor = valor[1:] if valor.startswith(" ") else valor
+            if campo == "id":
+                self._id = valor
+            elif campo == "event":
+                self._tipo = valor
+            elif campo == "data":
+                self._datos.append(valor)
@@ -0,0 +1,48 @@
+"""
+Esquemas de las respuestas de la API
+Modelos Pydantic que solo dependen de pydantic. Viven en el paquete del
+cliente para que este se pueda usar o instalar por separado, sin la
+configuración del servidor; la aplicación los importa desde aquí vía models.py.
+"""
+
+from pydantic import BaseModel
+from typing import List, Optional
+
+class Usuario(BaseModel):
+    """Modelo de un usuario tal como lo retornan las consultas"""
+    id: str
+    nombre: str
+    email: str
+    edad: int
+    fecha_registro: str
+
+class UserResponse(Usuario):
+    """Modelo de respuesta para usuarios registrados exitosamente"""
+    mensaje: str = "Usuario registrado exitosamente"
+
+class TokenResponse(BaseModel):
+    """Modelo de respuesta para un inicio de sesión exitoso"""
+    id: str
+    access_token: str
+    token_type: str = "bearer"
+    expira_en: int
+    mensaje: str = "Inicio de sesión exitoso"
+
+class ErrorResponse(BaseModel):
+    """Modelo para respuestas de error estandarizadas"""
+    error: str
+    detalle: str
+    codigo_error: str
+    timestamp: str
+
+class ResultadoLote(BaseModel):
+    """Resultado del registro de un usuario dentro de un lote"""
+    estado: int
+    usuario: Optional[UserResponse] = None
+    error: Optional[ErrorResponse] = None
+
+class RegistroLoteResponse(BaseModel):
+    """Modelo de respuesta para el registro por lotes"""
+    resultados: List[ResultadoLote]
+    registrados: int
+    errores: int
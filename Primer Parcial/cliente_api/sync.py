@@ -0,0 +1,104 @@
+"""
+Cliente síncrono de la API de Validación de Usuarios
+Usa un httpx.Client con pool de conexiones persistentes, timeouts y
+reintentos con jitter ante 429/503.
+"""
+
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import httpx
+
+from .esquemas import RegistroLoteResponse, TokenResponse, UserResponse, Usuario
+from . import base
+
+
+class ClienteAPI:
+    """
+    Cliente síncrono para todos los endpoints de la API.
+
+    Se recomienda usarlo como context manager para cerrar el pool de conexiones:
+
+        with ClienteAPI("http://localhost:8000") as cliente:
+            usuario = cliente.registrar("Juan Pérez", "juan@ejemplo.com", 30)
+    """
+
+    def __init__(self, base_url: str = "http://localhost:8000", timeout: float = 10.0,
+                 max_conexiones: int = 10, max_reintentos: int = 3,
+                 espera_base: float = 0.1, espera_max: float = 5.0,
+                 transport: Optional[httpx.BaseTransport] = None):
+        self.max_reintentos = max_reintentos
+        self.espera_base = espera_base
+        self.espera_max = espera_max
+        self._token: Optional[str] = None
+        self._http = httpx.Client(
+            base_url=base_url,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_conexiones, max_keepalive_connections=max_conexiones),
+            transport=transport
+        )
+
+    def __enter__(self) -> "ClienteAPI":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._http.close()
+
+    def _headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self._token}"} if self._token else {}
+
+    def _solicitud(self, metodo: str, ruta: str, **kwargs) -> httpx.Response:
+        """Enviar una solicitud reintentando ante 429/503"""
+        for intento in range(self.max_reintentos + 1):
+            response = self._http.request(metodo, ruta, headers=self._headers(), **kwargs)
+            if response.status_code not in base.ESTADOS_REINTENTABLES or intento == self.max_reintentos:
+                return base.verificar_respuesta(response)
+            time.sleep(base.calcular_espera(intento, response, self.espera_base, self.espera_max))
+        raise AssertionError("inalcanzable")
+
+    def registrar(self, nombre: str, email: str, edad: int, password: Optional[str] = None) -> UserResponse:
+        datos = base.datos_registro(nombre, email, edad, password)
+        return base.registro_desde_json(self._solicitud("POST", base.RUTA_REGISTRO, json=datos).json())
+
+    def registrar_lote(self, usuarios: List[Dict[str, Any]]) -> RegistroLoteResponse:
+        """Registrar varios usuarios en una sola solicitud (ver base.datos_registro)"""
+        return base.lote_desde_json(self._solicitud("POST", base.RUTA_REGISTRO_LOTE, json=usuarios).json())
+
+    def login(self, email: str, password: str) -> TokenResponse:
+        """Iniciar sesión; el token se usa en las siguientes solicitudes del cliente"""
+        response = self._solicitud("POST", base.RUTA_LOGIN, json={"email": email, "password": password})
+        token = base.token_desde_json(response.json())
+        self._token = token.access_token
+        return token
+
+    def listar_usuarios(self) -> List[Usuario]:
+        return base.usuarios_desde_json(self._solicitud("GET", base.RUTA_USUARIOS).json())
+
+    def obtener_usuario(self, user_id: str) -> Usuario:
+        return base.usuario_desde_json(self._solicitud("GET", f"{base.RUTA_USUARIOS}/{user_id}").json())
+
+    def buscar_similares(self, nombre: str, umbral: float = 0.6, limite: int = 10) -> List[Tuple[Usuario, float]]:
+        params = {"nombre": nombre, "umbral": umbral, "limite": limite}
+        return base.similares_desde_json(self._solicitud("GET", base.RUTA_SIMILARES, params=params).json())
+
+    def metricas(self) -> Dict[str, Any]:
+        return self._solicitud("GET", base.RUTA_METRICAS).json()
+
+    def info(self) -> Dict[str, Any]:
+        return self._solicitud("GET", "/").json()
+
+    def eventos(self, ultimo_id: Optional[str] = None) -> Iterator[Tuple[Optional[str], str, Any]]:
+        """Iterar el feed de registros; cada evento es (id, tipo, datos)"""
+        headers = self._headers()
+        if ultimo_id is not None:
+            headers["Last-Event-ID"] = ultimo_id
+        parser = base.ParserSSE()
+        with self._http.stream("GET", base.RUTA_EVENTOS, headers=headers, timeout=None) as response:
+            if response.status_code >= 400:
+                response.read()
+            base.verificar_respuesta(response)
+            for linea in response.iter_lines():
+                yield from parser.procesar(linea)
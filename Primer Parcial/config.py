@@ -3,9 +3,16 @@ Configuración de la API de Validación de Usuarios
 Archivo centralizado para configuraciones de seguridad, validación y comportamiento
 """
 
+import logging
 import os
+import secrets
 from typing import List
 
+logger = logging.getLogger(__name__)
+
+# Valor de ejemplo de la clave JWT; firmar tokens con él permite falsificarlos
+JWT_SECRET_KEY_EJEMPLO = "your-secret-key-change-in-production"
+
 class Settings:
     """Configuraciones de la aplicación"""
     
@@ -31,6 +38,11 @@ class Settings:
     NOMBRE_MAX_LENGTH: int = 50
     EDAD_MINIMA: int = 13
     EDAD_MAXIMA: int = 120
+    REGISTRO_LOTE_MAX: int = int(os.getenv("REGISTRO_LOTE_MAX", "100"))
+    
+    # Detección de nombres casi duplicados (índice de trigramas)
+    NOMBRE_SIMILITUD_VERIFICAR: bool = os.getenv("NOMBRE_SIMILITUD_VERIFICAR", "False").lower() == "true"
+    NOMBRE_SIMILITUD_UMBRAL: float = float(os.getenv("NOMBRE_SIMILITUD_UMBRAL", "0.8"))
     
     # Dominios de email bloqueados (temporales/desechables)
     DOMINIOS_BLOQUEADOS: List[str] = [
@@ -56,6 +68,30 @@ class Settings:
         "guerrillamail.org"
     ]
     
+    # Feed de eventos de registro (Server-Sent Events)
+    EVENTOS_BUFFER_MAX: int = int(os.getenv("EVENTOS_BUFFER_MAX", "1000"))  # eventos disponibles para reanudar
+    EVENTOS_COLA_MAX: int = int(os.getenv("EVENTOS_COLA_MAX", "100"))  # eventos pendientes por suscriptor
+    EVENTOS_HEARTBEAT_SEGUNDOS: float = float(os.getenv("EVENTOS_HEARTBEAT_SEGUNDOS", "15"))
+    
+    # Caché de lectura de usuarios (GET /api/usuarios/{user_id})
+    USUARIOS_CACHE_MAX_SIZE: int = int(os.getenv("USUARIOS_CACHE_MAX_SIZE", "10000"))  # 0 = sin entradas positivas
+    USUARIOS_CACHE_TTL_SEGUNDOS: float = float(os.getenv("USUARIOS_CACHE_TTL_SEGUNDOS", "300"))
+    USUARIOS_CACHE_MAX_NEGATIVOS: int = int(os.getenv("USUARIOS_CACHE_MAX_NEGATIVOS", "10000"))  # 0 = sin caché negativa
+    USUARIOS_CACHE_TTL_NEGATIVO_SEGUNDOS: float = float(os.getenv("USUARIOS_CACHE_TTL_NEGATIVO_SEGUNDOS", "30"))
+    
+    # Control de admisión (solicitudes en curso por clase de ruta)
+    ADMISION_ENABLED: bool = os.getenv("ADMISION_ENABLED", "True").lower() == "true"
+    ADMISION_LECTURA_MAX_EN_CURSO: int = int(os.getenv("ADMISION_LECTURA_MAX_EN_CURSO", "64"))
+    ADMISION_LECTURA_ESPERA_MAX: float = float(os.getenv("ADMISION_LECTURA_ESPERA_MAX", "0.5"))  # segundos
+    ADMISION_LECTURA_COLA_MAX: int = int(os.getenv("ADMISION_LECTURA_COLA_MAX", "256"))
+    ADMISION_REGISTRO_MAX_EN_CURSO: int = int(os.getenv("ADMISION_REGISTRO_MAX_EN_CURSO", "8"))
+    ADMISION_REGISTRO_ESPERA_MAX: float = float(os.getenv("ADMISION_REGISTRO_ESPERA_MAX", "2.0"))  # segundos
+    ADMISION_REGISTRO_COLA_MAX: int = int(os.getenv("ADMISION_REGISTRO_COLA_MAX", "64"))
+    
+    # Arranque rápido (esquema OpenAPI precomputado y precalentamiento)
+    OPENAPI_PRECOMPUTADO: str = os.getenv("OPENAPI_PRECOMPUTADO", os.path.join(os.path.dirname(os.path.abspath(__file__)), "openapi.json"))  # "" = generar
+    PRECALENTAR_EN_SEGUNDO_PLANO: bool = os.getenv("PRECALENTAR_EN_SEGUNDO_PLANO", "False").lower() == "true"
+    
     # Configuración de logging
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
     LOG_FORMAT: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -68,10 +104,14 @@ class Settings:
     # Configuración de base de datos (para futuras implementaciones)
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./usuarios.db")
     
-    # Configuración de autenticación (para futuras implementaciones)
-    JWT_SECRET_KEY: str = os.getenv("JWT_SECRET_KEY", "your-secret-key-change-in-production")
+    # Configuración de autenticación
+    # Sin JWT_SECRET_KEY se genera una clave aleatoria por proceso: los tokens no sirven
+    # entre instancias ni después de reiniciar
+    JWT_SECRET_KEY_GENERADA: bool = not os.getenv("JWT_SECRET_KEY")
+    JWT_SECRET_KEY: str = os.getenv("JWT_SECRET_KEY") or secrets.token_urlsafe(32)
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    JWT_CACHE_MAX_SIZE: int = int(os.getenv("JWT_CACHE_MAX_SIZE", "10000"))  # 0 = sin caché
     
     # Configuración de validación adicional
     EMAIL_VERIFICATION_REQUIRED: bool = os.getenv("EMAIL_VERIFICATION_REQUIRED", "False").lower() == "true"
@@ -80,6 +120,13 @@ class Settings:
     PASSWORD_REQUIRE_NUMBERS: bool = True
     PASSWORD_REQUIRE_UPPERCASE: bool = True
     
+    # Configuración del hashing de contraseñas (scrypt en un pool de procesos)
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1)))
+    PASSWORD_HASH_MAX_PENDIENTES: int = int(os.getenv("PASSWORD_HASH_MAX_PENDIENTES", "0"))  # 0 = 4 por worker
+    PASSWORD_SCRYPT_N: int = 2 ** 14
+    PASSWORD_SCRYPT_R: int = 8
+    PASSWORD_SCRYPT_P: int = 1
+    
     # Configuración de monitoreo
     ENABLE_METRICS: bool = os.getenv("ENABLE_METRICS", "False").lower() == "true"
     METRICS_PORT: int = int(os.getenv("METRICS_PORT", "9090"))
@@ -96,6 +143,13 @@ class Settings:
         """Obtener lista de dominios de email bloqueados"""
         return [dominio.lower() for dominio in cls.DOMINIOS_BLOQUEADOS]
     
+    @classmethod
+    def get_password_hash_max_pendientes(cls) -> int:
+        """Obtener el límite de hashes de contraseña en curso (admisión)"""
+        if cls.PASSWORD_HASH_MAX_PENDIENTES > 0:
+            return cls.PASSWORD_HASH_MAX_PENDIENTES
+        return cls.PASSWORD_HASH_WORKERS * 4
+    
     @classmethod
     def validate_config(cls) -> bool:
         """Validar que la configuración sea correcta"""
@@ -105,14 +159,30 @@ class Settings:
             assert cls.EDAD_MAXIMA > cls.EDAD_MINIMA, "Edad máxima debe ser mayor a la mínima"
             assert cls.NOMBRE_MIN_LENGTH > 0, "Longitud mínima del nombre debe ser mayor a 0"
             assert cls.NOMBRE_MAX_LENGTH > cls.NOMBRE_MIN_LENGTH, "Longitud máxima debe ser mayor a la mínima"
+            assert 0 < cls.NOMBRE_SIMILITUD_UMBRAL <= 1, "El umbral de similitud debe estar entre 0 y 1"
+            assert cls.PASSWORD_MIN_LENGTH > 0, "Longitud mínima de la contraseña debe ser mayor a 0"
+            assert cls.PASSWORD_HASH_WORKERS > 0, "Debe haber al menos un worker de hashing"
+            assert cls.EVENTOS_BUFFER_MAX > 0, "El buffer de eventos debe ser mayor a 0"
+            assert cls.EVENTOS_COLA_MAX > 0, "La cola de eventos por suscriptor debe ser mayor a 0"
+            assert cls.USUARIOS_CACHE_MAX_SIZE >= 0, "El tamaño de la caché de usuarios no puede ser negativo"
+            assert cls.USUARIOS_CACHE_TTL_SEGUNDOS > 0, "El TTL de la caché de usuarios debe ser mayor a 0"
+            assert cls.ADMISION_LECTURA_MAX_EN_CURSO > 0, "El límite de lecturas en curso debe ser mayor a 0"
+            assert cls.ADMISION_REGISTRO_MAX_EN_CURSO > 0, "El límite de registros en curso debe ser mayor a 0"
+            assert cls.JWT_ALGORITHM == "HS256", "Solo se soporta el algoritmo JWT HS256"
+            assert cls.DEBUG or cls.JWT_SECRET_KEY != JWT_SECRET_KEY_EJEMPLO, "JWT_SECRET_KEY usa el valor de ejemplo, defina una clave propia"
+            assert cls.ACCESS_TOKEN_EXPIRE_MINUTES > 0, "La expiración del token debe ser mayor a 0"
+            assert cls.JWT_CACHE_MAX_SIZE >= 0, "El tamaño de la caché de tokens no puede ser negativo"
             return True
         except AssertionError as e:
-            print(f"❌ Error de configuración: {e}")
+            logger.error(f"Error de configuración: {e}")
             return False
 
 # Instancia global de configuración
 settings = Settings()
 
-# Validar configuración al importar
+# Validar configuración al importar (solo comparaciones, no retrasa el arranque)
 if not settings.validate_config():
     raise ValueError("Configuración inválida. Revisa los parámetros.")
+
+if settings.JWT_SECRET_KEY_GENERADA:
+    logger.warning("JWT_SECRET_KEY no está definida: se usa una clave aleatoria de este proceso")
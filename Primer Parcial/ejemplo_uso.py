@@ -4,13 +4,18 @@ Ejemplo de uso de la API de Validación de Usuarios
 Este script demuestra cómo usar la API para registrar usuarios y manejar diferentes escenarios
 """
 
-import requests
 import json
 from datetime import datetime
 
+import httpx
+
+from cliente_api import ClienteAPI, ErrorAPI
+
 # Configuración
 BASE_URL = "http://localhost:8000"
-HEADERS = {"Content-Type": "application/json"}
+
+# Un solo cliente con pool de conexiones persistentes para toda la demostración
+cliente = ClienteAPI(BASE_URL, timeout=10.0)
 
 def print_separator(title):
     """Imprimir separador visual"""
@@ -18,11 +23,30 @@ def print_separator(title):
     print(f" {title}")
     print(f"{'='*60}")
 
-def print_response(response, title):
-    """Imprimir respuesta de la API de forma legible"""
+def print_response(resultado, title):
+    """Imprimir un resultado tipado o un ErrorAPI de forma legible"""
     print(f"\n📡 {title}")
-    print(f"Status Code: {response.status_code}")
-    print(f"Response: {json.dumps(response.json(), indent=2, ensure_ascii=False)}")
+    if isinstance(resultado, ErrorAPI):
+        print(f"Status Code: {resultado.status_code}")
+        datos = resultado.error.dict() if resultado.error else {}
+    else:
+        datos = resultado.dict() if hasattr(resultado, "dict") else resultado
+    print(f"Response: {json.dumps(datos, indent=2, ensure_ascii=False, default=str)}")
+
+def registrar(datos):
+    """Registrar un usuario; retorna el UserResponse o el ErrorAPI recibido"""
+    try:
+        return cliente.registrar(datos["nombre"], datos["email"], datos["edad"], datos.get("password"))
+    except ErrorAPI as e:
+        return e
+
+def print_caso(resultado):
+    """Imprimir el resultado de un caso de validación"""
+    if isinstance(resultado, ErrorAPI):
+        print(f"   Status: {resultado.status_code}")
+        print(f"   Error: {resultado.error.error if resultado.error else 'Error desconocido'}")
+    else:
+        print("   Status: 201")
 
 def test_registro_exitoso():
     """Probar registro exitoso de usuario"""
@@ -31,19 +55,16 @@ def test_registro_exitoso():
     user_data = {
         "nombre": "Ana María Rodríguez López",
         "email": "ana.rodriguez@ejemplo.com",
-        "edad": 29
+        "edad": 29,
+        "password": "Segura#2024"
     }
     
     print(f"📝 Intentando registrar usuario: {user_data['nombre']}")
     
-    response = requests.post(
-        f"{BASE_URL}/api/usuarios/registrar",
-        json=user_data,
-        headers=HEADERS
-    )
+    resultado = registrar(user_data)
     
-    print_response(response, "Registro Exitoso")
-    return response.json() if response.status_code == 201 else None
+    print_response(resultado, "Registro Exitoso")
+    return None if isinstance(resultado, ErrorAPI) else resultado
 
 def test_validacion_nombre():
     """Probar validaciones de nombre"""
@@ -74,15 +95,7 @@ def test_validacion_nombre():
         print(f"\n🔍 Probando: {caso['descripcion']}")
         print(f"   Datos: {caso}")
         
-        response = requests.post(
-            f"{BASE_URL}/api/usuarios/registrar",
-            json=caso,
-            headers=HEADERS
-        )
-        
-        print(f"   Status: {response.status_code}")
-        if response.status_code != 201:
-            print(f"   Error: {response.json().get('error', 'Error desconocido')}")
+        print_caso(registrar(caso))
 
 def test_validacion_email():
     """Probar validaciones de email"""
@@ -113,15 +126,7 @@ def test_validacion_email():
         print(f"\n🔍 Probando: {caso['descripcion']}")
         print(f"   Datos: {caso}")
         
-        response = requests.post(
-            f"{BASE_URL}/api/usuarios/registrar",
-            json=caso,
-            headers=HEADERS
-        )
-        
-        print(f"   Status: {response.status_code}")
-        if response.status_code != 201:
-            print(f"   Error: {response.json().get('error', 'Error desconocido')}")
+        print_caso(registrar(caso))
 
 def test_validacion_edad():
     """Probar validaciones de edad"""
@@ -152,15 +157,7 @@ def test_validacion_edad():
         print(f"\n🔍 Probando: {caso['descripcion']}")
         print(f"   Datos: {caso}")
         
-        response = requests.post(
-            f"{BASE_URL}/api/usuarios/registrar",
-            json=caso,
-            headers=HEADERS
-        )
-        
-        print(f"   Status: {response.status_code}")
-        if response.status_code != 201:
-            print(f"   Error: {response.json().get('error', 'Error desconocido')}")
+        print_caso(registrar(caso))
 
 def test_email_duplicado():
     """Probar prevención de emails duplicados"""
@@ -174,13 +171,9 @@ def test_email_duplicado():
     }
     
     print("📝 Registrando primer usuario...")
-    response1 = requests.post(
-        f"{BASE_URL}/api/usuarios/registrar",
-        json=user_data,
-        headers=HEADERS
-    )
+    resultado1 = registrar(user_data)
     
-    if response1.status_code == 201:
+    if not isinstance(resultado1, ErrorAPI):
         print("✅ Primer usuario registrado exitosamente")
         
         # Intentar registrar con mismo email
@@ -191,29 +184,31 @@ def test_email_duplicado():
         }
         
         print("📝 Intentando registrar segundo usuario con mismo email...")
-        response2 = requests.post(
-            f"{BASE_URL}/api/usuarios/registrar",
-            json=user_data2,
-            headers=HEADERS
-        )
+        resultado2 = registrar(user_data2)
         
-        print_response(response2, "Prevención de Duplicado")
+        print_response(resultado2, "Prevención de Duplicado")
     else:
-        print(f"❌ Error al registrar primer usuario: {response1.status_code}")
+        print(f"❌ Error al registrar primer usuario: {resultado1.status_code}")
 
 def test_endpoints_adicionales():
     """Probar endpoints adicionales"""
     print_separator("ENDPOINTS ADICIONALES")
     
-    # Listar usuarios
-    print("📋 Listando todos los usuarios...")
-    response = requests.get(f"{BASE_URL}/api/usuarios")
-    print_response(response, "Lista de Usuarios")
+    # Iniciar sesión: el cliente guarda el token para las siguientes solicitudes
+    print("🔑 Iniciando sesión...")
+    try:
+        print_response(cliente.login("ana.rodriguez@ejemplo.com", "Segura#2024"), "Inicio de Sesión")
+        
+        # Listar usuarios (requiere token)
+        print("\n📋 Listando todos los usuarios...")
+        usuarios = cliente.listar_usuarios()
+        print_response({"usuarios": [u.dict() for u in usuarios], "total": len(usuarios)}, "Lista de Usuarios")
+    except ErrorAPI as e:
+        print_response(e, "Error de Autenticación")
     
     # Información de la API
     print("\n📚 Obteniendo información de la API...")
-    response = requests.get(f"{BASE_URL}/")
-    print_response(response, "Información de la API")
+    print_response(cliente.info(), "Información de la API")
 
 def main():
     """Función principal que ejecuta todas las pruebas"""
@@ -223,12 +218,7 @@ def main():
     try:
         # Verificar que la API esté funcionando
         print("\n🔍 Verificando conectividad con la API...")
-        response = requests.get(f"{BASE_URL}/")
-        
-        if response.status_code != 200:
-            print(f"❌ Error: No se puede conectar a la API en {BASE_URL}")
-            print("   Asegúrate de que la API esté ejecutándose con: python main.py")
-            return
+        cliente.info()
         
         print("✅ API conectada exitosamente")
         
@@ -244,11 +234,15 @@ def main():
         print("🎉 Todas las pruebas han sido ejecutadas")
         print("📖 Revisa la documentación en: http://localhost:8000/docs")
         
-    except requests.exceptions.ConnectionError:
+    except httpx.ConnectError:
         print(f"❌ Error de conexión: No se puede conectar a {BASE_URL}")
-        print("   Asegúrate de que la API esté ejecutándose")
+        print("   Asegúrate de que la API esté ejecutándose con: python main.py")
+    except ErrorAPI as e:
+        print(f"❌ Error: La API respondió {e.status_code} en {BASE_URL}")
     except Exception as e:
         print(f"❌ Error inesperado: {str(e)}")
+    finally:
+        cliente.close()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,168 @@
+"""
+Feed de cambios con Server-Sent Events
+Cada registro publica un evento con un id `<época>-<secuencia>`: la época
+identifica a la instancia del bus, así un Last-Event-ID de antes de un
+reinicio o de otra instancia se detecta en lugar de confundirse con los
+ids nuevos. La secuencia es creciente dentro de la época. Los últimos
+eventos se guardan en un buffer circular acotado para permitir reanudar con
+Last-Event-ID, y cada suscriptor tiene una cola acotada: si se llena, el
+suscriptor se desconecta en lugar de acumular eventos sin límite.
+"""
+
+import asyncio
+import json
+import uuid
+from collections import deque
+from itertools import count
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Set, Tuple
+
+EVENTO_REGISTRO = "usuario_registrado"
+
+
+def formatear_sse(data: str, evento: Optional[str] = None, event_id: Optional[str] = None) -> str:
+    """Formatear un mensaje según el protocolo text/event-stream"""
+    lineas = []
+    if event_id is not None:
+        lineas.append(f"id: {event_id}")
+    if evento is not None:
+        lineas.append(f"event: {evento}")
+    lineas.extend(f"data: {linea}" for linea in data.split("\n"))
+    return "\n".join(lineas) + "\n\n"
+
+
+class Suscripcion:
+    """Suscriptor del feed con su cola acotada de eventos pendientes"""
+
+    def __init__(self, cola_max: int, desde: int, pendientes: List[Tuple[int, str]], desincronizado: bool):
+        self.cola: "asyncio.Queue[Optional[Tuple[int, str]]]" = asyncio.Queue(maxsize=cola_max)
+        self.desde = desde
+        self.pendientes = pendientes
+        self.desincronizado = desincronizado
+        self.desconectado = False
+
+
+class BusEventos:
+    """
+    Publica eventos de registro y los distribuye a los suscriptores.
+
+    La distribución se agenda con call_soon, así que publicar solo agrega el
+    evento al buffer y no agrega latencia al registro aunque haya cientos de
+    suscriptores.
+    """
+
+    def __init__(self, buffer_max: int, cola_max: int, epoca: Optional[str] = None):
+        self.cola_max = cola_max
+        self.epoca = epoca or uuid.uuid4().hex[:8]
+        self.desconexiones = 0
+        self._secuencia = count(1)
+        self._buffer: Deque[Tuple[int, str]] = deque(maxlen=buffer_max)
+        self._suscriptores: Set[Suscripcion] = set()
+
+    @property
+    def ultima_secuencia(self) -> int:
+        return self._buffer[-1][0] if self._buffer else 0
+
+    @property
+    def ultimo_id(self) -> str:
+        return self.id_evento(self.ultima_secuencia)
+
+    def id_evento(self, secuencia: int) -> str:
+        """Id SSE de un evento de este bus"""
+        return f"{self.epoca}-{secuencia}"
+
+    def secuencia_de(self, event_id: str) -> Optional[int]:
+        """Secuencia de un id de este bus; None si es de otra época o no tiene el formato"""
+        epoca, _, secuencia = event_id.rpartition("-")
+        if epoca != self.epoca or not secuencia.isdigit():
+            return None
+        return int(secuencia)
+
+    @property
+    def suscriptores(self) -> int:
+        return len(self._suscriptores)
+
+    def publicar(self, datos: Dict[str, Any]) -> str:
+        """Agregar un evento al buffer y agendar su distribución; retorna su id"""
+        event_id = next(self._secuencia)
+        evento = (event_id, json.dumps(datos, ensure_ascii=False))
+        self._buffer.append(evento)
+
+        if self._suscriptores:
+            try:
+                asyncio.get_running_loop().call_soon(self._distribuir, evento)
+            except RuntimeError:
+                self._distribuir(evento)
+        return self.id_evento(event_id)
+
+    def _distribuir(self, evento: Tuple[int, str]) -> None:
+        for suscripcion in list(self._suscriptores):
+            # Eventos anteriores a la suscripción ya se entregan desde el buffer
+            if evento[0] <= suscripcion.desde:
+                continue
+            try:
+                suscripcion.cola.put_nowait(evento)
+            except asyncio.QueueFull:
+                self._desconectar(suscripcion)
+
+    def _desconectar(self, suscripcion: Suscripcion) -> None:
+        """Desconectar a un consumidor lento descartando su cola"""
+        self._suscriptores.discard(suscripcion)
+        suscripcion.desconectado = True
+        self.desconexiones += 1
+        while not suscripcion.cola.empty():
+            suscripcion.cola.get_nowait()
+        suscripcion.cola.put_nowait(None)
+
+    def suscribir(self, ultimo_id: Optional[str] = None) -> Suscripcion:
+        """
+        Registrar un suscriptor; con `ultimo_id` (Last-Event-ID) se reenvían los
+        eventos posteriores que sigan en el buffer. Si alguno ya salió del buffer,
+        o el id es de otra época (reinicio u otra instancia), la suscripción queda
+        marcada como desincronizada.
+        """
+        pendientes: List[Tuple[int, str]] = []
+        desincronizado = False
+        if ultimo_id is not None:
+            secuencia = self.secuencia_de(ultimo_id)
+            if secuencia is None or secuencia > self.ultima_secuencia:
+                desincronizado = True
+            else:
+                pendientes = [evento for evento in self._buffer if evento[0] > secuencia]
+                # Se perdieron eventos que ya salieron del buffer
+                desincronizado = bool(self._buffer and secuencia + 1 < self._buffer[0][0])
+
+        suscripcion = Suscripcion(self.cola_max, self.ultima_secuencia, pendientes, desincronizado)
+        self._suscriptores.add(suscripcion)
+        return suscripcion
+
+    def cancelar(self, suscripcion: Suscripcion) -> None:
+        self._suscriptores.discard(suscripcion)
+
+
+async def stream_eventos(bus: BusEventos, ultimo_id: Optional[str] = None,
+                         heartbeat: float = 15.0) -> AsyncIterator[str]:
+    """Generar el stream SSE de un suscriptor, con comentarios de heartbeat"""
+    suscripcion = bus.suscribir(ultimo_id)
+    try:
+        yield "retry: 3000\n\n"
+        if suscripcion.desincronizado:
+            # Con id para que el cliente reanude desde aquí tras resincronizar y no
+            # vuelva a enviar el Last-Event-ID viejo en cada reconexión
+            actual = bus.id_evento(suscripcion.desde)
+            yield formatear_sse(json.dumps({"ultimo_id": actual}), evento="reinicio", event_id=actual)
+        for secuencia, data in suscripcion.pendientes:
+            yield formatear_sse(data, evento=EVENTO_REGISTRO, event_id=bus.id_evento(secuencia))
+
+        while True:
+            try:
+                evento = await asyncio.wait_for(suscripcion.cola.get(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+                continue
+            if evento is None:
+                yield formatear_sse("consumidor lento", evento="desconectado")
+                return
+            secuencia, data = evento
+            yield formatear_sse(data, evento=EVENTO_REGISTRO, event_id=bus.id_evento(secuencia))
+    finally:
+        bus.cancelar(suscripcion)
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Generar el esquema OpenAPI precomputado
+La aplicación lo carga desde OPENAPI_PRECOMPUTADO en lugar de generarlo en el
+primer acceso a /docs. Se ejecuta al construir o desplegar, con las mismas
+dependencias que usará la aplicación (el archivo no se versiona); guarda una
+huella del código y las versiones que lo generaron y, si no coincide, la
+aplicación lo ignora y genera el esquema.
+
+Uso: python generar_openapi.py [--salida openapi.json]
+"""
+
+import argparse
+import os
+
+from arranque import guardar_openapi
+from config import settings
+from main import app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generar el esquema OpenAPI precomputado")
+    parser.add_argument("--salida", default=settings.OPENAPI_PRECOMPUTADO or
+                        os.path.join(os.path.dirname(os.path.abspath(__file__)), "openapi.json"))
+    args = parser.parse_args()
+
+    esquema = guardar_openapi(app, args.salida)
+    print(f"Esquema OpenAPI de {settings.APP_NAME} {app.version}: {len(esquema['paths'])} rutas en {args.salida}")
+
+
+if __name__ == "__main__":
+    main()
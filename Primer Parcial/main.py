@@ -1,14 +1,27 @@
-from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, HTTPException, Request, Depends, Query, Header
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import ValidationError
+import asyncio
 import uuid
 from datetime import datetime
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 
-from models import UserRegistration, UserResponse, ErrorResponse
+from models import (
+    UserRegistration, UserResponse, ErrorResponse, LoginRequest, TokenResponse,
+    ResultadoLote, RegistroLoteResponse
+)
+from security import password_hasher, HasherSaturado, PASSWORD_HASH_FICTICIO
+from auth import crear_token_acceso, verificar_token, TokenInvalido
+from similitud import IndiceTrigramas, normalizar_nombre
+from eventos import BusEventos, stream_eventos
+from cache import CacheLRU
+from admision import ClaseAdmision, LimitadorAdmision, MiddlewareAdmision
+from arranque import Precalentamiento, instalar_openapi_precomputado
+from config import settings
 
 # Configuración de logging
 logging.basicConfig(level=logging.INFO)
@@ -22,7 +35,45 @@ app = FastAPI(
     redoc_url="/redoc"
 )
 
+# Esquema OpenAPI precomputado (python generar_openapi.py) en lugar de generarlo en /docs
+if settings.OPENAPI_PRECOMPUTADO:
+    instalar_openapi_precomputado(app, settings.OPENAPI_PRECOMPUTADO)
+
+def clasificar_solicitud(metodo: str, ruta: str) -> Optional[str]:
+    """Asignar cada solicitud a una clase de admisión (None = sin límite)"""
+    if metodo == "POST" and ruta in ("/api/usuarios/registrar", "/api/usuarios/login"):
+        return "registro"
+    # Cada usuario de un lote ocupa su propio lugar de "registro" (ver registrar_usuarios_lote)
+    if ruta == "/api/usuarios/registrar/lote":
+        return None
+    # El feed de eventos es una conexión de larga duración, no se limita como lectura
+    if metodo == "GET" and ruta.startswith("/api/usuarios") and ruta != "/api/usuarios/eventos":
+        return "lectura"
+    return None
+
+# Control de admisión: lecturas baratas y registros costosos con límites separados
+limitador_admision = LimitadorAdmision(
+    clases={
+        "lectura": ClaseAdmision(
+            "lectura",
+            max_en_curso=settings.ADMISION_LECTURA_MAX_EN_CURSO,
+            espera_max=settings.ADMISION_LECTURA_ESPERA_MAX,
+            cola_max=settings.ADMISION_LECTURA_COLA_MAX
+        ),
+        "registro": ClaseAdmision(
+            "registro",
+            max_en_curso=settings.ADMISION_REGISTRO_MAX_EN_CURSO,
+            espera_max=settings.ADMISION_REGISTRO_ESPERA_MAX,
+            cola_max=settings.ADMISION_REGISTRO_COLA_MAX
+        ),
+    },
+    clasificar=clasificar_solicitud
+)
+if settings.ADMISION_ENABLED:
+    app.add_middleware(MiddlewareAdmision, limitador=limitador_admision)
+
 # Configuración de CORS
+# Se registra al final para quedar por fuera de la admisión: los 503 también llevan cabeceras CORS
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # En producción, especificar dominios específicos
@@ -33,6 +84,62 @@ app.add_middleware(
 
 # Almacenamiento en memoria (en producción usar base de datos)
 users_db: Dict[str, Dict[str, Any]] = {}
+# Índice email -> id para login y emails duplicados sin recorrer users_db
+usuarios_por_email: Dict[str, str] = {}
+# Hashes de contraseña separados de users_db para no exponerlos en las consultas
+passwords_db: Dict[str, str] = {}
+# Índice de trigramas de nombres, actualizado en cada registro
+indice_nombres = IndiceTrigramas()
+# Caché de lectura delante del almacenamiento de usuarios
+usuarios_cache = CacheLRU(
+    max_size=settings.USUARIOS_CACHE_MAX_SIZE,
+    ttl=settings.USUARIOS_CACHE_TTL_SEGUNDOS,
+    max_negativos=settings.USUARIOS_CACHE_MAX_NEGATIVOS,
+    ttl_negativo=settings.USUARIOS_CACHE_TTL_NEGATIVO_SEGUNDOS
+)
+# Feed de eventos de registro para consumidores externos
+bus_eventos = BusEventos(
+    buffer_max=settings.EVENTOS_BUFFER_MAX,
+    cola_max=settings.EVENTOS_COLA_MAX
+)
+
+# Recursos que se crean en el primer uso o, con PRECALENTAR_EN_SEGUNDO_PLANO, al arrancar
+precalentamiento = Precalentamiento()
+precalentamiento.registrar("pool_hashing", password_hasher.precalentar)
+precalentamiento.registrar("openapi", lambda: app.openapi())
+
+bearer_scheme = HTTPBearer(auto_error=False)
+
+async def usuario_autenticado(
+    credenciales: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme)
+) -> Dict[str, Any]:
+    """Dependencia que exige un token Bearer válido y retorna su payload"""
+    if credenciales is None:
+        raise HTTPException(
+            status_code=401,
+            detail="Se requiere autenticación",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+    
+    try:
+        return verificar_token(credenciales.credentials)
+    except TokenInvalido as e:
+        raise HTTPException(
+            status_code=401,
+            detail=str(e),
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+
+@app.on_event("startup")
+async def iniciar_precalentamiento():
+    """Precalentar en segundo plano sin demorar la aceptación de conexiones"""
+    if settings.PRECALENTAR_EN_SEGUNDO_PLANO:
+        precalentamiento.iniciar()
+
+@app.on_event("shutdown")
+async def cerrar_pool_hashing():
+    """Cerrar el pool de procesos de hashing al detener la aplicación"""
+    password_hasher.shutdown()
 
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
@@ -65,7 +172,8 @@ async def http_exception_handler(request: Request, exc: HTTPException):
     
     return JSONResponse(
         status_code=exc.status_code,
-        content=error_response.dict()
+        content=error_response.dict(),
+        headers=getattr(exc, "headers", None)
     )
 
 @app.exception_handler(Exception)
@@ -85,29 +193,37 @@ async def general_exception_handler(request: Request, exc: Exception):
         content=error_response.dict()
     )
 
-@app.post("/api/usuarios/registrar", 
-          response_model=UserResponse,
-          status_code=201,
-          summary="Registrar nuevo usuario",
-          description="Endpoint para registrar un nuevo usuario con validaciones robustas")
-async def registrar_usuario(user_data: UserRegistration):
-    """
-    Registra un nuevo usuario con las siguientes validaciones:
-    
-    - **Nombre**: Debe contener al menos nombre y apellido, solo letras y espacios
-    - **Email**: Debe ser un email válido y no temporal/desechable
-    - **Edad**: Debe estar entre 13 y 120 años
-    
-    Retorna los datos del usuario registrado o un error de validación.
-    """
+async def procesar_registro(user_data: UserRegistration) -> UserResponse:
+    """Aplicar las validaciones de negocio y guardar un usuario ya validado por el modelo"""
     try:
         # Verificar si el email ya existe
-        if any(user["email"] == user_data.email for user in users_db.values()):
+        if user_data.email in usuarios_por_email:
             raise HTTPException(
                 status_code=409,
                 detail="El email ya está registrado en el sistema"
             )
         
+        # Verificar nombres casi duplicados (registros fraudulentos)
+        if settings.NOMBRE_SIMILITUD_VERIFICAR and indice_nombres.buscar(
+            user_data.nombre, umbral=settings.NOMBRE_SIMILITUD_UMBRAL, limite=1
+        ):
+            raise HTTPException(
+                status_code=409,
+                detail="Ya existe un usuario registrado con un nombre muy similar"
+            )
+        
+        # Calcular el hash de la contraseña en el pool de procesos
+        password_hash = None
+        if user_data.password is not None:
+            password_hash = await password_hasher.hash(user_data.password)
+            
+            # El email pudo registrarse mientras se calculaba el hash
+            if user_data.email in usuarios_por_email:
+                raise HTTPException(
+                    status_code=409,
+                    detail="El email ya está registrado en el sistema"
+                )
+        
         # Generar ID único
         user_id = str(uuid.uuid4())
         fecha_registro = datetime.now().isoformat()
@@ -123,6 +239,12 @@ async def registrar_usuario(user_data: UserRegistration):
         
         # Guardar en "base de datos"
         users_db[user_id] = user_dict
+        usuarios_por_email[user_data.email] = user_id
+        if password_hash is not None:
+            passwords_db[user_id] = password_hash
+        usuarios_cache.invalidar(user_id)
+        indice_nombres.agregar(user_id, user_data.nombre)
+        bus_eventos.publicar(user_dict)
         
         logger.info(f"Usuario registrado exitosamente: {user_data.email}")
         
@@ -136,6 +258,12 @@ async def registrar_usuario(user_data: UserRegistration):
         
     except HTTPException:
         raise
+    except HasherSaturado:
+        raise HTTPException(
+            status_code=503,
+            detail="Demasiadas solicitudes de registro en curso, intente más tarde",
+            headers={"Retry-After": "1"}
+        )
     except Exception as e:
         logger.error(f"Error inesperado al registrar usuario: {str(e)}")
         raise HTTPException(
@@ -143,10 +271,140 @@ async def registrar_usuario(user_data: UserRegistration):
             detail="Error interno del servidor al procesar el registro"
         )
 
+@app.post("/api/usuarios/registrar", 
+          response_model=UserResponse,
+          status_code=201,
+          summary="Registrar nuevo usuario",
+          description="Endpoint para registrar un nuevo usuario con validaciones robustas")
+async def registrar_usuario(user_data: UserRegistration):
+    """
+    Registra un nuevo usuario con las siguientes validaciones:
+    
+    - **Nombre**: Debe contener al menos nombre y apellido, solo letras y espacios
+    - **Email**: Debe ser un email válido y no temporal/desechable
+    - **Edad**: Debe estar entre 13 y 120 años
+    - **Password** (opcional): Debe cumplir la política de contraseñas de la configuración
+    - **Nombres similares** (opcional, `NOMBRE_SIMILITUD_VERIFICAR`): Rechaza nombres casi idénticos a uno ya registrado
+    
+    Retorna los datos del usuario registrado o un error de validación.
+    """
+    return await procesar_registro(user_data)
+
+@app.post("/api/usuarios/registrar/lote",
+          response_model=RegistroLoteResponse,
+          summary="Registrar usuarios por lote",
+          description="Endpoint para registrar varios usuarios en una sola solicitud, con un resultado por usuario")
+async def registrar_usuarios_lote(usuarios: List[Dict[str, Any]]):
+    """
+    Registra hasta `REGISTRO_LOTE_MAX` usuarios con las mismas validaciones que el registro individual.
+    
+    Cada usuario se valida y registra por separado: el resultado de cada posición indica su
+    código de estado (201, 409, 422, 503...) y los datos registrados o el error correspondiente.
+    
+    Cada usuario cuenta como un registro para el control de admisión, y el lote no envía al
+    pool de hashing más contraseñas a la vez que workers tiene, para no saturarlo.
+    """
+    if len(usuarios) > settings.REGISTRO_LOTE_MAX:
+        raise HTTPException(
+            status_code=413,
+            detail=f"El lote no puede tener más de {settings.REGISTRO_LOTE_MAX} usuarios"
+        )
+    
+    clase_registro = limitador_admision.clases["registro"] if settings.ADMISION_ENABLED else None
+    limite_hashing = asyncio.Semaphore(max(1, min(password_hasher.workers, password_hasher.max_pendientes)))
+    
+    def resultado_error(e: HTTPException) -> ResultadoLote:
+        return ResultadoLote(estado=e.status_code, error=ErrorResponse(
+            error=e.detail,
+            detalle="No se pudo registrar el usuario",
+            codigo_error=f"HTTP_{e.status_code}",
+            timestamp=datetime.now().isoformat()
+        ))
+    
+    async def registrar_admitido(user_data: UserRegistration) -> ResultadoLote:
+        if clase_registro is None:
+            return ResultadoLote(estado=201, usuario=await procesar_registro(user_data))
+        async with clase_registro.lugar() as admitido:
+            if not admitido:
+                return resultado_error(HTTPException(
+                    status_code=503,
+                    detail="Demasiadas solicitudes de registro en curso, intente más tarde"
+                ))
+            return ResultadoLote(estado=201, usuario=await procesar_registro(user_data))
+    
+    async def registrar_uno(datos: Dict[str, Any]) -> ResultadoLote:
+        try:
+            user_data = UserRegistration(**datos)
+        except (ValidationError, TypeError):
+            return ResultadoLote(estado=422, error=ErrorResponse(
+                error="Error de validación",
+                detalle="Los datos proporcionados no cumplen con los requisitos",
+                codigo_error="VALIDATION_ERROR",
+                timestamp=datetime.now().isoformat()
+            ))
+        try:
+            async with limite_hashing:
+                return await registrar_admitido(user_data)
+        except HTTPException as e:
+            return resultado_error(e)
+    
+    # Los hashes de contraseña del lote se calculan en paralelo en el pool de procesos
+    resultados = await asyncio.gather(*(registrar_uno(datos) for datos in usuarios))
+    registrados = sum(1 for resultado in resultados if resultado.estado == 201)
+    
+    return RegistroLoteResponse(
+        resultados=resultados,
+        registrados=registrados,
+        errores=len(resultados) - registrados
+    )
+
+@app.post("/api/usuarios/login",
+          response_model=TokenResponse,
+          summary="Iniciar sesión",
+          description="Endpoint para verificar el email y la contraseña de un usuario y emitir un token JWT")
+async def login_usuario(credenciales: LoginRequest):
+    """Verifica las credenciales de un usuario registrado con contraseña y emite un token de acceso"""
+    try:
+        user_id = usuarios_por_email.get(credenciales.email)
+        password_hash = passwords_db.get(user_id) if user_id else None
+        
+        # Sin hash registrado se verifica igual contra uno ficticio (mismo costo de scrypt)
+        valida = await password_hasher.verify(credenciales.password, password_hash or PASSWORD_HASH_FICTICIO)
+        if password_hash is None or not valida:
+            raise HTTPException(
+                status_code=401,
+                detail="Credenciales inválidas"
+            )
+        
+        access_token, expira_en = crear_token_acceso(user_id, credenciales.email)
+        
+        logger.info(f"Inicio de sesión exitoso: {credenciales.email}")
+        
+        return TokenResponse(
+            id=user_id,
+            access_token=access_token,
+            expira_en=expira_en
+        )
+        
+    except HTTPException:
+        raise
+    except HasherSaturado:
+        raise HTTPException(
+            status_code=503,
+            detail="Demasiados inicios de sesión en curso, intente más tarde",
+            headers={"Retry-After": "1"}
+        )
+    except Exception as e:
+        logger.error(f"Error inesperado al iniciar sesión: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail="Error interno del servidor al iniciar sesión"
+        )
+
 @app.get("/api/usuarios", 
          summary="Listar usuarios",
-         description="Endpoint para listar todos los usuarios registrados")
-async def listar_usuarios():
+         description="Endpoint para listar todos los usuarios registrados (requiere token Bearer)")
+async def listar_usuarios(usuario: Dict[str, Any] = Depends(usuario_autenticado)):
     """Lista todos los usuarios registrados en el sistema"""
     try:
         return {
@@ -160,19 +418,68 @@ async def listar_usuarios():
             detail="Error interno del servidor al listar usuarios"
         )
 
+@app.get("/api/usuarios/eventos",
+         summary="Feed de registros (Server-Sent Events)",
+         description="Stream de eventos de registro con ids `<época>-<secuencia>`; admite reanudar con Last-Event-ID (requiere token Bearer)")
+async def eventos_usuarios(
+    last_event_id: Optional[str] = Header(None),
+    usuario: Dict[str, Any] = Depends(usuario_autenticado)
+):
+    """
+    Emite un evento `usuario_registrado` por cada registro nuevo.
+    
+    - Con `Last-Event-ID` se reenvían los eventos posteriores que sigan en el buffer
+    - Si ya no están disponibles, o el id es de otra época (la instancia se reinició), se emite un evento
+      `reinicio` y el cliente debe resincronizar con `GET /api/usuarios`
+    - Un consumidor que no lee a tiempo recibe `desconectado` y se cierra su conexión
+    """
+    return StreamingResponse(
+        stream_eventos(bus_eventos, last_event_id or None, heartbeat=settings.EVENTOS_HEARTBEAT_SEGUNDOS),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.get("/api/usuarios/similares",
+         summary="Buscar usuarios con nombre similar",
+         description="Endpoint para buscar usuarios con nombres casi duplicados (requiere token Bearer)")
+async def buscar_usuarios_similares(
+    nombre: str = Query(..., min_length=2, max_length=50, description="Nombre a comparar"),
+    umbral: float = Query(0.6, gt=0, le=1, description="Similitud mínima (Jaccard de trigramas)"),
+    limite: int = Query(10, ge=1, le=100, description="Máximo de resultados"),
+    usuario: Dict[str, Any] = Depends(usuario_autenticado)
+):
+    """Busca usuarios cuyo nombre normalizado sea similar al indicado"""
+    try:
+        similares = [
+            {**users_db[user_id], "similitud": round(puntaje, 3)}
+            for user_id, puntaje in indice_nombres.buscar(nombre, umbral=umbral, limite=limite)
+        ]
+        return {
+            "nombre_normalizado": normalizar_nombre(nombre),
+            "similares": similares,
+            "total": len(similares)
+        }
+    except Exception as e:
+        logger.error(f"Error al buscar usuarios similares: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail="Error interno del servidor al buscar usuarios similares"
+        )
+
 @app.get("/api/usuarios/{user_id}", 
          summary="Obtener usuario por ID",
-         description="Endpoint para obtener un usuario específico por su ID")
-async def obtener_usuario(user_id: str):
-    """Obtiene un usuario específico por su ID"""
+         description="Endpoint para obtener un usuario específico por su ID (requiere token Bearer)")
+async def obtener_usuario(user_id: str, usuario: Dict[str, Any] = Depends(usuario_autenticado)):
+    """Obtiene un usuario específico por su ID, pasando por la caché de lectura"""
     try:
-        if user_id not in users_db:
+        user = await usuarios_cache.obtener(user_id, users_db.get)
+        if user is None:
             raise HTTPException(
                 status_code=404,
                 detail="Usuario no encontrado"
             )
         
-        return users_db[user_id]
+        return user
         
     except HTTPException:
         raise
@@ -183,6 +490,39 @@ async def obtener_usuario(user_id: str):
             detail="Error interno del servidor al obtener usuario"
         )
 
+@app.get("/api/metricas",
+         summary="Métricas de operación",
+         description="Profundidad de colas, rechazos por sobrecarga y estadísticas de cachés (requiere token Bearer)")
+async def metricas(usuario: Dict[str, Any] = Depends(usuario_autenticado)):
+    """Profundidad de colas, rechazos por sobrecarga y estadísticas de cachés"""
+    return {
+        "admision": limitador_admision.estadisticas(),
+        "cache_usuarios": usuarios_cache.estadisticas(),
+        "hashing": {
+            "en_curso": password_hasher.en_curso,
+            "max_pendientes": password_hasher.max_pendientes,
+            "workers": password_hasher.workers
+        },
+        "eventos": {
+            "suscriptores": bus_eventos.suscriptores,
+            "ultimo_id": bus_eventos.ultimo_id,
+            "desconexiones": bus_eventos.desconexiones
+        }
+    }
+
+@app.get("/api/salud/listo",
+         summary="Preparación de la instancia",
+         description="Retorna 200 cuando la instancia puede recibir tráfico y 503 mientras se precalienta")
+async def salud_listo():
+    """Estado de preparación para el balanceador o el orquestador"""
+    if not precalentamiento.listo:
+        raise HTTPException(
+            status_code=503,
+            detail="La instancia se está precalentando",
+            headers={"Retry-After": "1"}
+        )
+    return precalentamiento.estado()
+
 @app.get("/", summary="Información de la API")
 async def root():
     """Endpoint raíz con información de la API"""
@@ -191,7 +531,13 @@ async def root():
         "version": "1.0.0",
         "endpoints": {
             "registro": "/api/usuarios/registrar",
+            "registro_lote": "/api/usuarios/registrar/lote",
+            "login": "/api/usuarios/login",
             "listar": "/api/usuarios",
+            "similares": "/api/usuarios/similares",
+            "eventos": "/api/usuarios/eventos",
+            "metricas": "/api/metricas",
+            "listo": "/api/salud/listo",
             "obtener": "/api/usuarios/{user_id}",
             "documentacion": "/docs"
         }
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Medición del arranque en frío de la API
+Reporta el tiempo de importar main.py y, para cada modo de arranque, el tiempo
+desde que se lanza uvicorn hasta la primera respuesta y hasta que
+/api/salud/listo responde 200, junto con la latencia de las primeras
+solicitudes que dependen de recursos diferidos (/openapi.json y un registro
+con contraseña, que levanta el pool de hashing).
+
+Antes de medir genera openapi.json como en un despliegue.
+
+Uso: python medir_arranque.py [--repeticiones 5]
+"""
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+
+import httpx
+
+MODOS = [
+    ("OpenAPI generado", {"OPENAPI_PRECOMPUTADO": "", "PRECALENTAR_EN_SEGUNDO_PLANO": "false"}),
+    ("OpenAPI precomputado", {"PRECALENTAR_EN_SEGUNDO_PLANO": "false"}),
+    ("precomputado + precalentar", {"PRECALENTAR_EN_SEGUNDO_PLANO": "true"}),
+]
+
+CODIGO_IMPORTACION = "import time; t = time.perf_counter(); import main; print(time.perf_counter() - t)"
+
+
+def entorno(variables):
+    env = dict(os.environ)
+    env.update(variables)
+    return env
+
+
+def medir_importacion(repeticiones: int):
+    """Tiempo de importar main.py y del proceso completo (intérprete incluido)"""
+    importacion, proceso = [], []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        salida = subprocess.run([sys.executable, "-c", CODIGO_IMPORTACION],
+                                capture_output=True, text=True, check=True)
+        proceso.append(time.perf_counter() - inicio)
+        importacion.append(float(salida.stdout.strip().splitlines()[-1]))
+    return statistics.median(importacion), statistics.median(proceso)
+
+
+def esperar(cliente: httpx.Client, ruta: str, estado_ok=None) -> float:
+    """Sondear la ruta hasta obtener respuesta (o el estado indicado); retorna el instante"""
+    while True:
+        try:
+            response = cliente.get(ruta)
+            if estado_ok is None or response.status_code == estado_ok:
+                return time.perf_counter()
+        except httpx.TransportError:
+            pass
+        time.sleep(0.005)
+
+
+def latencia(funcion) -> float:
+    inicio = time.perf_counter()
+    funcion()
+    return time.perf_counter() - inicio
+
+
+def medir_modo(variables):
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        puerto = s.getsockname()[1]
+    inicio = time.perf_counter()
+    proceso = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(puerto), "--log-level", "warning"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=entorno(variables)
+    )
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{puerto}", timeout=30) as cliente:
+            primera = esperar(cliente, "/") - inicio
+            listo = esperar(cliente, "/api/salud/listo", 200) - inicio
+            datos = {"nombre": "Usuario Arranque", "email": f"arranque{uuid.uuid4().hex[:8]}@ejemplo.com",
+                     "edad": 30, "password": "Secreta123!"}
+            registro = lambda: cliente.post("/api/usuarios/registrar", json=datos).raise_for_status()
+            openapi = lambda: cliente.get("/openapi.json").raise_for_status()
+            resultado = {
+                "primera": primera,
+                "listo": listo,
+                "openapi_1": latencia(openapi),
+                "openapi_2": latencia(openapi),
+                "registro_1": latencia(registro),
+            }
+            datos["email"] = f"arranque{uuid.uuid4().hex[:8]}@ejemplo.com"
+            resultado["registro_2"] = latencia(registro)
+            return resultado
+    finally:
+        proceso.terminate()
+        proceso.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Medición del arranque en frío de la API")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    # Paso de despliegue: generar openapi.json con las dependencias instaladas
+    subprocess.run([sys.executable, "generar_openapi.py"], cwd=os.path.dirname(os.path.abspath(__file__)),
+                   capture_output=True, check=True)
+
+    importacion, proceso = medir_importacion(args.repeticiones)
+    print(f"importar main.py: {importacion * 1000:.1f} ms | proceso python -c 'import main': {proceso * 1000:.1f} ms")
+    print()
+
+    columnas = ["primera", "listo", "openapi_1", "openapi_2", "registro_1", "registro_2"]
+    print(f"{'modo (mediana ms)':>28} " + " ".join(f"{c:>11}" for c in columnas))
+    for nombre, variables in MODOS:
+        corridas = [medir_modo(variables) for _ in range(args.repeticiones)]
+        medianas = [statistics.median(c[columna] for c in corridas) * 1000 for columna in columnas]
+        print(f"{nombre:>28} " + " ".join(f"{m:>11.1f}" for m in medianas))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,10 @@ from pydantic import BaseModel, EmailStr, Field, validator
 from typing import Optional
 import re
 
+from config import settings
+# Los esquemas de respuesta viven en el paquete del cliente, que no depende de config
+from cliente_api.esquemas import ErrorResponse, RegistroLoteResponse, ResultadoLote, TokenResponse, UserResponse, Usuario
+
 class UserRegistration(BaseModel):
     """
     Modelo para registro de usuarios con validaciones robustas
@@ -28,6 +32,13 @@ class UserRegistration(BaseModel):
         example=25
     )
     
+    password: Optional[str] = Field(
+        None,
+        max_length=128,
+        description="Contraseña para iniciar sesión (opcional)",
+        example="Secreta#2024"
+    )
+    
     @validator('nombre')
     def validate_nombre(cls, v):
         """Validar que el nombre contenga solo letras, espacios y caracteres especiales válidos"""
@@ -69,19 +80,33 @@ class UserRegistration(BaseModel):
             raise ValueError('La edad proporcionada no es realista')
         
         return v
+    
+    @validator('password')
+    def validate_password(cls, v):
+        """Validar la contraseña según la política definida en la configuración"""
+        if v is None:
+            return v
+        return validar_politica_password(v)
 
-class UserResponse(BaseModel):
-    """Modelo de respuesta para usuarios registrados exitosamente"""
-    id: str
-    nombre: str
-    email: str
-    edad: int
-    fecha_registro: str
-    mensaje: str = "Usuario registrado exitosamente"
+def validar_politica_password(v: str) -> str:
+    """Aplicar PASSWORD_MIN_LENGTH y las reglas PASSWORD_REQUIRE_* de Settings"""
+    if len(v) < settings.PASSWORD_MIN_LENGTH:
+        raise ValueError(f'La contraseña debe tener al menos {settings.PASSWORD_MIN_LENGTH} caracteres')
+    if settings.PASSWORD_REQUIRE_UPPERCASE and not any(c.isupper() for c in v):
+        raise ValueError('La contraseña debe incluir al menos una letra mayúscula')
+    if settings.PASSWORD_REQUIRE_NUMBERS and not any(c.isdigit() for c in v):
+        raise ValueError('La contraseña debe incluir al menos un número')
+    if settings.PASSWORD_REQUIRE_SPECIAL_CHARS and all(c.isalnum() or c.isspace() for c in v):
+        raise ValueError('La contraseña debe incluir al menos un carácter especial')
+    
+    return v
 
-class ErrorResponse(BaseModel):
-    """Modelo para respuestas de error estandarizadas"""
-    error: str
-    detalle: str
-    codigo_error: str
-    timestamp: str
+class LoginRequest(BaseModel):
+    """Modelo para inicio de sesión con email y contraseña"""
+    email: EmailStr = Field(..., example="juan.perez@ejemplo.com")
+    password: str = Field(..., max_length=128, example="Secreta#2024")
+    
+    @validator('email')
+    def normalizar_email(cls, v):
+        """Normalizar el email igual que en el registro"""
+        return v.lower()
@@ -0,0 +1,169 @@
+"""
+Hashing y verificación de contraseñas
+scrypt es intencionalmente costoso en CPU y memoria, por lo que se ejecuta en un
+pool de procesos para no bloquear el event loop y aprovechar varios núcleos.
+"""
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import logging
+import os
+import threading
+from typing import TYPE_CHECKING, Optional
+
+from config import settings
+
+if TYPE_CHECKING:
+    # concurrent.futures.process importa multiprocessing; se carga al crear el pool
+    from concurrent.futures import ProcessPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+SCRYPT_PREFIJO = "scrypt"
+SALT_BYTES = 16
+HASH_BYTES = 32
+
+
+class HasherSaturado(Exception):
+    """Se alcanzó el límite de hashes de contraseña en curso o el pool se está recreando"""
+
+
+def hash_password(password: str, n: int = settings.PASSWORD_SCRYPT_N,
+                  r: int = settings.PASSWORD_SCRYPT_R, p: int = settings.PASSWORD_SCRYPT_P) -> str:
+    """Calcular el hash scrypt de una contraseña (bloqueante, se ejecuta en el pool)"""
+    salt = os.urandom(SALT_BYTES)
+    digest = hashlib.scrypt(
+        password.encode("utf-8"), salt=salt, n=n, r=r, p=p,
+        maxmem=256 * n * r + 1024 * 1024, dklen=HASH_BYTES
+    )
+    return "$".join([
+        SCRYPT_PREFIJO, str(n), str(r), str(p),
+        base64.b64encode(salt).decode("ascii"),
+        base64.b64encode(digest).decode("ascii")
+    ])
+
+
+def verify_password(password: str, password_hash: str) -> bool:
+    """Verificar una contraseña contra su hash scrypt (bloqueante, se ejecuta en el pool)"""
+    try:
+        prefijo, n, r, p, salt, esperado = password_hash.split("$")
+        if prefijo != SCRYPT_PREFIJO:
+            return False
+        n, r, p = int(n), int(r), int(p)
+        esperado = base64.b64decode(esperado)
+        digest = hashlib.scrypt(
+            password.encode("utf-8"), salt=base64.b64decode(salt), n=n, r=r, p=p,
+            maxmem=256 * n * r + 1024 * 1024, dklen=len(esperado)
+        )
+    except ValueError:
+        return False
+    return hmac.compare_digest(digest, esperado)
+
+
+# Hash con los parámetros actuales que no corresponde a ninguna contraseña; se verifica
+# cuando el usuario no existe para que el login tarde lo mismo y no revele emails registrados
+PASSWORD_HASH_FICTICIO = "$".join([
+    SCRYPT_PREFIJO, str(settings.PASSWORD_SCRYPT_N), str(settings.PASSWORD_SCRYPT_R), str(settings.PASSWORD_SCRYPT_P),
+    base64.b64encode(bytes(SALT_BYTES)).decode("ascii"),
+    base64.b64encode(bytes(HASH_BYTES)).decode("ascii")
+])
+
+
+def _pid_worker() -> int:
+    return os.getpid()
+
+
+class PasswordHasher:
+    """
+    Ejecuta hash/verificación en un ProcessPoolExecutor dimensionado.
+
+    El número de operaciones en curso (ejecutándose o en cola del pool) está
+    limitado; al superarlo se lanza HasherSaturado en lugar de encolar sin límite.
+    Si un worker muere el pool queda roto: se descarta para que la siguiente
+    operación cree uno nuevo y las afectadas también fallan con HasherSaturado.
+    """
+
+    def __init__(self, workers: int, max_pendientes: int):
+        self.workers = workers
+        self.max_pendientes = max_pendientes
+        self._pool: Optional["ProcessPoolExecutor"] = None
+        self._en_curso = 0
+        self._lock = threading.Lock()
+
+    @property
+    def en_curso(self) -> int:
+        return self._en_curso
+
+    def _get_pool(self) -> "ProcessPoolExecutor":
+        """Crear el pool de forma diferida en el primer uso"""
+        with self._lock:
+            if self._pool is None:
+                from concurrent.futures import ProcessPoolExecutor
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            return self._pool
+
+    def _descartar_pool(self, pool: "ProcessPoolExecutor") -> None:
+        """Descartar un pool roto, salvo que otra operación ya lo haya reemplazado"""
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False)
+
+    def precalentar(self) -> int:
+        """
+        Crear el pool y levantar sus procesos antes del primer registro
+        (bloqueante). Retorna la cantidad de workers distintos que respondieron.
+        """
+        pool = self._get_pool()
+        # Enviar todas las tareas antes de esperar para que cada una levante un worker
+        futuros = [pool.submit(_pid_worker) for _ in range(self.workers)]
+        return len({futuro.result() for futuro in futuros})
+
+    async def _ejecutar(self, funcion, *args):
+        with self._lock:
+            if self._en_curso >= self.max_pendientes:
+                raise HasherSaturado()
+            self._en_curso += 1
+        try:
+            pool = self._get_pool()
+            from concurrent.futures.process import BrokenProcessPool
+            loop = asyncio.get_running_loop()
+            try:
+                return await loop.run_in_executor(pool, funcion, *args)
+            except BrokenProcessPool as e:
+                logger.warning(f"Un worker del pool de hashing terminó abruptamente, se recreará el pool: {str(e)}")
+                self._descartar_pool(pool)
+                raise HasherSaturado() from e
+        finally:
+            with self._lock:
+                self._en_curso -= 1
+
+    async def hash(self, password: str) -> str:
+        """Obtener el hash de una contraseña sin bloquear el event loop"""
+        return await self._ejecutar(hash_password, password)
+
+    async def verify(self, password: str, password_hash: str) -> bool:
+        """Verificar una contraseña sin bloquear el event loop"""
+        return await self._ejecutar(verify_password, password, password_hash)
+
+    def reconfigurar(self, workers: int, max_pendientes: Optional[int] = None) -> None:
+        """Cambiar el tamaño del pool (usado por el benchmark para variar los workers)"""
+        self.shutdown()
+        self.workers = workers
+        self.max_pendientes = max_pendientes or workers * 4
+
+    def shutdown(self) -> None:
+        """Cerrar el pool de procesos"""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True)
+                self._pool = None
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pendientes=settings.get_password_hash_max_pendientes()
+)
+
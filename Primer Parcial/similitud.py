@@ -0,0 +1,213 @@
+"""
+Detección de nombres casi duplicados
+Los nombres se normalizan (mayúsculas, acentos y espacios) y se indexan en un
+índice invertido que se actualiza en cada registro: por trigramas, separados
+por tamaño del nombre, y por palabras completas. Los candidatos se obtienen de
+las listas más cortas y se puntúan con la similitud de Jaccard de trigramas.
+"""
+
+import math
+import unicodedata
+from array import array
+from collections import Counter
+from itertools import chain
+from typing import Dict, FrozenSet, List, Set, Tuple
+
+
+def normalizar_nombre(nombre: str) -> str:
+    """Normalizar un nombre: sin acentos, en minúsculas y con espacios simples"""
+    descompuesto = unicodedata.normalize("NFKD", nombre)
+    sin_acentos = "".join(c for c in descompuesto if not unicodedata.combining(c))
+    return " ".join(sin_acentos.lower().split())
+
+
+def trigramas(nombre_normalizado: str) -> FrozenSet[str]:
+    """Obtener los trigramas de un nombre ya normalizado"""
+    texto = f" {nombre_normalizado} "
+    return frozenset(texto[i:i + 3] for i in range(len(texto) - 2))
+
+
+class IndiceTrigramas:
+    """
+    Índice invertido de nombres normalizados distintos.
+
+    Los usuarios con el mismo nombre normalizado comparten una sola entrada, y
+    las listas se guardan como array de enteros para mantener el índice compacto.
+    Hay dos fuentes de candidatos, cada una con su presupuesto de postings:
+
+    - Palabras: un error de tipeo cambia una sola palabra, así que el nombre
+      original contiene las demás. Se recorren solo las listas de las palabras
+      más raras de la consulta (`max_postings_palabras`).
+    - Trigramas por tamaño: un nombre con |B| trigramas necesita compartir al
+      menos umbral/(1+umbral)*(|A|+|B|) con la consulta, lo que permite revisar
+      pocas listas por tamaño y descartar por conteo. Se recorren primero los
+      tamaños cercanos al de la consulta mientras alcance `max_postings`.
+
+    El costo de cada búsqueda no crece con el número de usuarios; cuando los
+    presupuestos no alcanzan la búsqueda es aproximada. El mismo nombre
+    normalizado se encuentra siempre, con una consulta al diccionario.
+    """
+
+    # Listas extra revisadas por tamaño: más listas exigen más coincidencias y dejan menos candidatos
+    LISTAS_EXTRA = 2
+
+    def __init__(self, max_postings: int = 5000, max_postings_palabras: int = 10000):
+        self.max_postings = max_postings
+        self.max_postings_palabras = max_postings_palabras
+        self._postings: Dict[int, Dict[str, array]] = {}
+        self._postings_palabras: Dict[str, array] = {}
+        self._doc_por_nombre: Dict[str, int] = {}
+        self._nombres: List[str] = []
+        self._usuarios: List[List[str]] = []
+        self._tamanos = array("H")
+        self._total_usuarios = 0
+
+    def __len__(self) -> int:
+        return self._total_usuarios
+
+    def agregar(self, user_id: str, nombre: str) -> None:
+        """Indexar el nombre de un usuario recién registrado"""
+        normalizado = normalizar_nombre(nombre)
+        self._total_usuarios += 1
+
+        doc = self._doc_por_nombre.get(normalizado)
+        if doc is not None:
+            self._usuarios[doc].append(user_id)
+            return
+
+        grams = trigramas(normalizado)
+        doc = len(self._nombres)
+        self._doc_por_nombre[normalizado] = doc
+        self._nombres.append(normalizado)
+        self._usuarios.append([user_id])
+        self._tamanos.append(len(grams))
+        por_tamano = self._postings.setdefault(len(grams), {})
+        for gram in grams:
+            posting = por_tamano.get(gram)
+            if posting is None:
+                posting = por_tamano[gram] = array("I")
+            posting.append(doc)
+        for palabra in set(normalizado.split()):
+            posting = self._postings_palabras.get(palabra)
+            if posting is None:
+                posting = self._postings_palabras[palabra] = array("I")
+            posting.append(doc)
+
+    def _candidatos_por_palabras(self, normalizado: str, exacto_encontrado: bool) -> Set[int]:
+        """Nombres que difieren de la consulta en a lo sumo una palabra"""
+        listas = sorted(
+            ((self._postings_palabras.get(palabra, ()), palabra) for palabra in set(normalizado.split())),
+            key=lambda lista: len(lista[0])
+        )
+        desconocidas = sum(1 for posting, _ in listas if not posting)
+        conocidas = [(posting, palabra) for posting, palabra in listas if posting]
+        # Con dos palabras desconocidas no es un error en una palabra; si el nombre
+        # ya existe tal cual, tampoco es una variante con un error de tipeo
+        if not conocidas or desconocidas > 1 or (desconocidas == 0 and exacto_encontrado):
+            return set()
+
+        # La palabra desconocida es la del error: el original contiene todas las conocidas.
+        # Si todas son conocidas el error pudo dar otra palabra válida: todas menos una.
+        requeridas = len(conocidas) if desconocidas else max(1, len(conocidas) - 1)
+        buscadas = [f" {palabra} " for _, palabra in conocidas]
+        # Con una sola palabra requerida no hay filtro: todo lo recorrido se puntúa
+        presupuesto = self.max_postings_palabras if requeridas > 1 else self.max_postings_palabras // 5
+
+        if requeridas == len(conocidas) >= 2 and len(conocidas[1][0]) <= 16 * len(conocidas[0][0]):
+            # Listas de tamaño parecido: intersectarlas en C es más barato que revisar nombres
+            if len(conocidas[0][0]) > presupuesto:
+                return set()
+            docs = set(conocidas[0][0]).intersection(conocidas[1][0])
+        else:
+            # El original aparece en al menos una de las listas más cortas
+            recorrer = [posting for posting, _ in conocidas[:len(conocidas) - requeridas + 1]]
+            if sum(map(len, recorrer)) > presupuesto:
+                return set()
+            docs = chain.from_iterable(recorrer)
+
+        return {
+            doc for doc in docs
+            if sum(map(f" {self._nombres[doc]} ".__contains__, buscadas)) >= requeridas
+        }
+
+    def _candidatos_por_trigramas(self, consulta: FrozenSet[str], umbral: float,
+                                  tamano_min: int, tamano_max: int) -> Set[int]:
+        """Nombres que pueden alcanzar el umbral, revisando primero los tamaños cercanos"""
+        candidatos: Set[int] = set()
+        presupuesto = self.max_postings
+        n = len(consulta)
+        for tamano in sorted(range(tamano_min, tamano_max + 1), key=lambda t: abs(t - n)):
+            por_tamano = self._postings.get(tamano)
+            if not por_tamano:
+                continue
+            # Trigramas compartidos mínimos para Jaccard >= umbral con un nombre de este tamaño
+            minimo = math.ceil(umbral / (1 + umbral) * (n + tamano) - 1e-9)
+            if minimo > min(n, tamano):
+                continue
+
+            # Con `minimo` compartidos, el candidato aparece en al menos `requeridos`
+            # de las `revisar` listas más cortas
+            listas = sorted((por_tamano.get(gram, ()) for gram in consulta), key=len)
+            revisar = min(n, n - minimo + 1 + self.LISTAS_EXTRA)
+            requeridos = minimo - (n - revisar)
+            costo = sum(len(posting) for posting in listas[:revisar])
+            if costo > presupuesto:
+                continue
+            presupuesto -= costo
+
+            conteos = Counter(chain.from_iterable(listas[:revisar]))
+            candidatos.update(doc for doc, conteo in conteos.items() if conteo >= requeridos)
+        return candidatos
+
+    def buscar(self, nombre: str, umbral: float = 0.6, limite: int = 10) -> List[Tuple[str, float]]:
+        """Buscar usuarios con similitud mayor o igual al umbral, ordenados por similitud"""
+        normalizado = normalizar_nombre(nombre)
+        consulta = trigramas(normalizado)
+        if not consulta:
+            return []
+        exacto = self._doc_por_nombre.get(normalizado)
+
+        # Los usuarios con el mismo nombre normalizado ya llenan el resultado
+        if exacto is not None and len(self._usuarios[exacto]) >= limite:
+            return [(user_id, 1.0) for user_id in self._usuarios[exacto][:limite]]
+
+        # Filtro por tamaño: |B| debe estar entre umbral*|A| y |A|/umbral
+        n = len(consulta)
+        tamano_min = max(1, math.ceil(umbral * n - 1e-9))
+        tamano_max = math.floor(n / umbral + 1e-9)
+
+        candidatos = self._candidatos_por_palabras(normalizado, exacto is not None)
+        candidatos |= self._candidatos_por_trigramas(consulta, umbral, tamano_min, tamano_max)
+        candidatos.discard(exacto)
+
+        puntuados = []
+        for doc in candidatos:
+            tamano = self._tamanos[doc]
+            if not tamano_min <= tamano <= tamano_max:
+                continue
+            # Un trigrama de la consulta pertenece al candidato si es subcadena de su texto
+            interseccion = sum(map(f" {self._nombres[doc]} ".__contains__, consulta))
+            puntaje = interseccion / (n + tamano - interseccion)
+            if puntaje >= umbral:
+                puntuados.append((puntaje, doc))
+
+        if exacto is not None:
+            puntuados.append((1.0, exacto))
+
+        puntuados.sort(reverse=True)
+        resultados = []
+        for puntaje, doc in puntuados:
+            for user_id in self._usuarios[doc]:
+                if len(resultados) >= limite:
+                    return resultados
+                resultados.append((user_id, puntaje))
+        return resultados
+
+    def clear(self) -> None:
+        self._postings.clear()
+        self._postings_palabras.clear()
+        self._doc_por_nombre.clear()
+        self._nombres.clear()
+        self._usuarios.clear()
+        self._tamanos = array("H")
+        self._total_usuarios = 0
@@ -1,10 +1,45 @@
+import asyncio
+import json
+import os
+import shutil
+import subprocess
+import sys
+import httpx
 import pytest
 from fastapi.testclient import TestClient
-from main import app
-from models import UserRegistration
+from main import app, usuarios_cache, usuarios_por_email, limitador_admision
+from security import password_hasher
+from models import UserRegistration, UserResponse
+from security import hash_password, verify_password, PASSWORD_HASH_FICTICIO, PasswordHasher, HasherSaturado
+from auth import crear_token_acceso, decodificar_token, token_cache, TokenInvalido
+from similitud import IndiceTrigramas, normalizar_nombre
+from config import settings, Settings, JWT_SECRET_KEY_EJEMPLO
+from eventos import BusEventos, stream_eventos
+from cache import CacheLRU
+from admision import ClaseAdmision, LimitadorAdmision, MiddlewareAdmision
+from cliente_api import ClienteAPI, ClienteAPIAsync, ErrorAPI
+from arranque import Precalentamiento, cargar_openapi, generar_openapi, guardar_openapi, CLAVE_HUELLA
 
 client = TestClient(app)
 
+_auth_headers = {}
+
+def obtener_headers_auth():
+    """Registrar un usuario con contraseña e iniciar sesión para obtener un token"""
+    if not _auth_headers:
+        client.post("/api/usuarios/registrar", json={
+            "nombre": "Admin Pruebas",
+            "email": "admin.pruebas@ejemplo.com",
+            "edad": 30,
+            "password": "Admin#2024"
+        })
+        response = client.post("/api/usuarios/login", json={
+            "email": "admin.pruebas@ejemplo.com",
+            "password": "Admin#2024"
+        })
+        _auth_headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+    return _auth_headers
+
 def test_registro_usuario_valido():
     """Prueba registro de usuario con datos válidos"""
     user_data = {
@@ -113,7 +148,7 @@ def test_registro_email_duplicado():
 
 def test_listar_usuarios():
     """Prueba listar usuarios registrados"""
-    response = client.get("/api/usuarios")
+    response = client.get("/api/usuarios", headers=obtener_headers_auth())
     assert response.status_code == 200
     
     data = response.json()
@@ -137,7 +172,7 @@ def test_obtener_usuario_por_id():
     user_id = response_registro.json()["id"]
     
     # Luego obtener el usuario por ID
-    response_obtener = client.get(f"/api/usuarios/{user_id}")
+    response_obtener = client.get(f"/api/usuarios/{user_id}", headers=obtener_headers_auth())
     assert response_obtener.status_code == 200
     
     data = response_obtener.json()
@@ -147,7 +182,7 @@ def test_obtener_usuario_por_id():
 
 def test_obtener_usuario_inexistente():
     """Prueba obtener usuario con ID inexistente"""
-    response = client.get("/api/usuarios/usuario_inexistente")
+    response = client.get("/api/usuarios/usuario_inexistente", headers=obtener_headers_auth())
     assert response.status_code == 404
 
 def test_endpoint_raiz():
@@ -160,5 +195,644 @@ def test_endpoint_raiz():
     assert "version" in data
     assert "endpoints" in data
 
+def test_registro_password_debil():
+    """Prueba registro con contraseña que no cumple la política"""
+    user_data = {
+        "nombre": "Raúl Herrera",
+        "email": "raul@ejemplo.com",
+        "edad": 33,
+        "password": "debil"
+    }
+    
+    response = client.post("/api/usuarios/registrar", json=user_data)
+    assert response.status_code == 422
+
+def test_registro_password_null():
+    """Prueba que una contraseña null explícita se trate como ausente"""
+    user_data = {
+        "nombre": "Elena Ríos",
+        "email": "elena.null@ejemplo.com",
+        "edad": 29,
+        "password": None
+    }
+    
+    response = client.post("/api/usuarios/registrar", json=user_data)
+    assert response.status_code == 201
+    
+    user_data["email"] = "elena.null.lote@ejemplo.com"
+    response = client.post("/api/usuarios/registrar/lote", json=[user_data])
+    assert response.json()["resultados"][0]["estado"] == 201
+
+def test_login_usuario():
+    """Prueba inicio de sesión con contraseña correcta e incorrecta"""
+    user_data = {
+        "nombre": "Sofía Navarro",
+        "email": "sofia@ejemplo.com",
+        "edad": 27,
+        "password": "Segura#2024"
+    }
+    
+    response_registro = client.post("/api/usuarios/registrar", json=user_data)
+    assert response_registro.status_code == 201
+    assert "password" not in response_registro.json()
+    assert usuarios_por_email["sofia@ejemplo.com"] == response_registro.json()["id"]
+    
+    response_ok = client.post("/api/usuarios/login", json={
+        "email": "sofia@ejemplo.com",
+        "password": "Segura#2024"
+    })
+    assert response_ok.status_code == 200
+    assert response_ok.json()["id"] == response_registro.json()["id"]
+    
+    response_error = client.post("/api/usuarios/login", json={
+        "email": "sofia@ejemplo.com",
+        "password": "Incorrecta#1"
+    })
+    assert response_error.status_code == 401
+
+def test_login_email_inexistente_verifica_hash_ficticio(monkeypatch):
+    """Prueba que el login de un email no registrado también ejecute scrypt"""
+    verificados = []
+    verify_original = password_hasher.verify
+    
+    async def verify(password, password_hash):
+        verificados.append(password_hash)
+        return await verify_original(password, password_hash)
+    
+    monkeypatch.setattr(password_hasher, "verify", verify)
+    response = client.post("/api/usuarios/login", json={
+        "email": "nadie.registrado@ejemplo.com",
+        "password": "Segura#2024"
+    })
+    assert response.status_code == 401
+    assert verificados == [PASSWORD_HASH_FICTICIO]
+    assert verify_password("Segura#2024", PASSWORD_HASH_FICTICIO) is False
+
+def test_hash_password_verificacion():
+    """Prueba que el hash scrypt verifique solo la contraseña original"""
+    password_hash = hash_password("Segura#2024", n=2 ** 10)
+    assert password_hash.startswith("scrypt$")
+    assert verify_password("Segura#2024", password_hash)
+    assert not verify_password("Otra#2024", password_hash)
+    assert not verify_password("Segura#2024", "hash_invalido")
+
+def test_endpoints_lectura_requieren_token():
+    """Prueba que los endpoints de lectura rechacen solicitudes sin token válido"""
+    response = client.get("/api/usuarios")
+    assert response.status_code == 401
+    assert response.headers["WWW-Authenticate"] == "Bearer"
+    
+    token = obtener_headers_auth()["Authorization"]
+    response = client.get("/api/usuarios", headers={"Authorization": token[:-2] + "xx"})
+    assert response.status_code == 401
+
+def test_token_expirado_y_cache():
+    """Prueba expiración del token y aciertos en la caché de tokens verificados"""
+    token_expirado, _ = crear_token_acceso("id", "expirado@ejemplo.com", expira_en_minutos=-1)
+    with pytest.raises(TokenInvalido):
+        decodificar_token(token_expirado)
+    
+    headers = obtener_headers_auth()
+    client.get("/api/usuarios", headers=headers)
+    aciertos = token_cache.aciertos
+    client.get("/api/usuarios", headers=headers)
+    assert token_cache.aciertos == aciertos + 1
+
+def test_clave_jwt_de_ejemplo_rechazada(monkeypatch):
+    """Prueba que la configuración rechace la clave JWT de ejemplo fuera de DEBUG"""
+    assert settings.JWT_SECRET_KEY != JWT_SECRET_KEY_EJEMPLO
+    monkeypatch.setattr(Settings, "JWT_SECRET_KEY", JWT_SECRET_KEY_EJEMPLO)
+    monkeypatch.setattr(Settings, "DEBUG", False)
+    assert settings.validate_config() is False
+    monkeypatch.setattr(Settings, "DEBUG", True)
+    assert settings.validate_config() is True
+
+def test_normalizar_nombre():
+    """Prueba que la normalización ignore mayúsculas, acentos y espacios repetidos"""
+    assert normalizar_nombre("JUAN PÉREZ") == "juan perez"
+    assert normalizar_nombre("  Juan   Perez ") == "juan perez"
+
+def test_buscar_usuarios_similares():
+    """Prueba la búsqueda de nombres casi duplicados"""
+    user_data = {
+        "nombre": "Gustavo Villalobos",
+        "email": "gustavo.villalobos@ejemplo.com",
+        "edad": 45
+    }
+    response_registro = client.post("/api/usuarios/registrar", json=user_data)
+    assert response_registro.status_code == 201
+    
+    response = client.get(
+        "/api/usuarios/similares",
+        params={"nombre": "GUSTAVO  VILLALOBOS"},
+        headers=obtener_headers_auth()
+    )
+    assert response.status_code == 200
+    
+    data = response.json()
+    assert data["nombre_normalizado"] == "gustavo villalobos"
+    assert data["similares"][0]["id"] == response_registro.json()["id"]
+    assert data["similares"][0]["similitud"] == 1.0
+    
+    response = client.get(
+        "/api/usuarios/similares",
+        params={"nombre": "Gustavo Villalobo"},
+        headers=obtener_headers_auth()
+    )
+    assert response_registro.json()["id"] in [u["id"] for u in response.json()["similares"]]
+
+def test_indice_trigramas_candidatos():
+    """Prueba las dos fuentes de candidatos del índice y el atajo del nombre exacto"""
+    indice = IndiceTrigramas(max_postings=0)
+    indice.agregar("u1", "Gustavo Adolfo Villalobos")
+    indice.agregar("u2", "Gustavo Adolfo Villalobos")
+    indice.agregar("u3", "Marcela Villalobos Ruiz")
+    
+    # Sin presupuesto de trigramas, el error en una palabra se encuentra por las demás palabras
+    assert [r[0] for r in indice.buscar("Gustavo Adolfo Villalbos")] == ["u1", "u2"]
+    assert indice.buscar("Gustavo Adolfo Villalbos")[0][1] >= 0.6
+    
+    # El nombre exacto llena el límite sin recorrer postings
+    assert indice.buscar("GUSTAVO ADOLFO VILLALOBOS", limite=2) == [("u1", 1.0), ("u2", 1.0)]
+    
+    # Sin presupuesto de palabras se usan los trigramas agrupados por tamaño
+    indice = IndiceTrigramas(max_postings_palabras=0)
+    indice.agregar("u1", "Gustavo Adolfo Villalobos")
+    assert [r[0] for r in indice.buscar("Gustavo Adolfo Villalbos")] == ["u1"]
+
+def test_registro_nombre_similar_rechazado(monkeypatch):
+    """Prueba la verificación opcional de nombres similares en el registro"""
+    monkeypatch.setattr(settings, "NOMBRE_SIMILITUD_VERIFICAR", True)
+    
+    response1 = client.post("/api/usuarios/registrar", json={
+        "nombre": "Bartolomé Echeverría",
+        "email": "bartolome@ejemplo.com",
+        "edad": 50
+    })
+    assert response1.status_code == 201
+    
+    response2 = client.post("/api/usuarios/registrar", json={
+        "nombre": "BARTOLOME  ECHEVERRIA",
+        "email": "bartolome.otro@ejemplo.com",
+        "edad": 50
+    })
+    assert response2.status_code == 409
+
+def test_eventos_requiere_token():
+    """Prueba que el feed de eventos exija autenticación"""
+    response = client.get("/api/usuarios/eventos")
+    assert response.status_code == 401
+
+def test_bus_eventos_reanudar_y_desconectar():
+    """Prueba reanudar con Last-Event-ID y desconexión de consumidores lentos"""
+    async def escenario():
+        bus = BusEventos(buffer_max=3, cola_max=2)
+        for i in range(5):
+            bus.publicar({"id": str(i)})
+        
+        # Los eventos 4 y 5 siguen en el buffer
+        reanudada = bus.suscribir(ultimo_id=bus.id_evento(3))
+        assert [evento[0] for evento in reanudada.pendientes] == [4, 5]
+        assert not reanudada.desincronizado
+        
+        # El evento 2 ya salió del buffer
+        assert bus.suscribir(ultimo_id=bus.id_evento(1)).desincronizado
+        
+        # Un id de antes de un reinicio no se confunde con los ids nuevos
+        reiniciado = BusEventos(buffer_max=50, cola_max=2)
+        for i in range(50):
+            reiniciado.publicar({"id": str(i)})
+        anterior = reiniciado.suscribir(ultimo_id=bus.id_evento(40))
+        assert anterior.desincronizado and anterior.pendientes == []
+        assert reiniciado.suscribir(ultimo_id="40").desincronizado
+        
+        lenta = bus.suscribir()
+        for i in range(3):
+            bus.publicar({"id": f"nuevo{i}"})
+        await asyncio.sleep(0)
+        
+        assert lenta.desconectado
+        assert await lenta.cola.get() is None
+        assert bus.desconexiones >= 1
+    
+    asyncio.run(escenario())
+
+def test_stream_eventos_formato_sse():
+    """Prueba el formato SSE del stream de eventos"""
+    async def escenario():
+        bus = BusEventos(buffer_max=10, cola_max=10)
+        bus.publicar({"id": "a"})
+        stream = stream_eventos(bus, ultimo_id=bus.id_evento(0), heartbeat=0.01)
+        
+        assert await stream.__anext__() == "retry: 3000\n\n"
+        assert await stream.__anext__() == f'id: {bus.epoca}-1\nevent: usuario_registrado\ndata: {{"id": "a"}}\n\n'
+        assert await stream.__anext__() == ": ping\n\n"
+        
+        bus.publicar({"id": "b"})
+        assert (await stream.__anext__()).startswith(f"id: {bus.epoca}-2\n")
+        await stream.aclose()
+        assert bus.suscriptores == 0
+        
+        # El reinicio lleva el id actual para que la siguiente reconexión reanude desde ahí
+        stream = stream_eventos(bus, ultimo_id="deadbeef-1", heartbeat=0.01)
+        assert await stream.__anext__() == "retry: 3000\n\n"
+        reinicio = await stream.__anext__()
+        assert reinicio == f'id: {bus.epoca}-2\nevent: reinicio\ndata: {{"ultimo_id": "{bus.epoca}-2"}}\n\n'
+        await stream.aclose()
+        assert not bus.suscribir(ultimo_id=f"{bus.epoca}-2").desincronizado
+    
+    asyncio.run(escenario())
+
+def test_cache_lru_read_through():
+    """Prueba caché de lectura: LRU, caché negativa, TTL e invalidación"""
+    almacenamiento = {"a": {"id": "a"}, "b": {"id": "b"}, "c": {"id": "c"}}
+    cargas = []
+    
+    def cargar(clave):
+        cargas.append(clave)
+        return almacenamiento.get(clave)
+    
+    async def escenario():
+        cache = CacheLRU(max_size=2, ttl=60, max_negativos=2, ttl_negativo=60)
+        assert await cache.obtener("a", cargar) == {"id": "a"}
+        assert await cache.obtener("a", cargar) == {"id": "a"}
+        assert cargas == ["a"]
+        
+        # "b" y "c" expulsan a la menos usada ("a")
+        await cache.obtener("b", cargar)
+        await cache.obtener("c", cargar)
+        await cache.obtener("a", cargar)
+        assert cargas == ["a", "b", "c", "a"]
+        
+        # Caché negativa e invalidación al escribir
+        assert await cache.obtener("x", cargar) is None
+        assert await cache.obtener("x", cargar) is None
+        assert cargas.count("x") == 1
+        almacenamiento["x"] = {"id": "x"}
+        cache.invalidar("x")
+        assert await cache.obtener("x", cargar) == {"id": "x"}
+        
+        estadisticas = cache.estadisticas()
+        assert estadisticas["aciertos_negativos"] == 1
+        assert estadisticas["invalidaciones"] == 1
+        
+        # Las entradas vencidas se recargan
+        expirable = CacheLRU(max_size=2, ttl=-1)
+        await expirable.obtener("a", cargar)
+        await expirable.obtener("a", cargar)
+        assert expirable.fallos == 2
+    
+    asyncio.run(escenario())
+
+def test_cache_lru_invalidacion_durante_carga():
+    """Prueba que una carga asíncrona no guarde un valor invalidado mientras se cargaba"""
+    almacenamiento = {}
+    
+    async def escenario():
+        cache = CacheLRU(max_size=2, ttl=60, max_negativos=2, ttl_negativo=60)
+        consultado = asyncio.Event()
+        continuar = asyncio.Event()
+        
+        async def cargar_lento(clave):
+            valor = almacenamiento.get(clave)
+            consultado.set()
+            await continuar.wait()
+            return valor
+        
+        # La lectura ve el id inexistente y la escritura lo crea antes de que termine
+        lectura = asyncio.create_task(cache.obtener("a", cargar_lento))
+        await consultado.wait()
+        almacenamiento["a"] = {"id": "a"}
+        cache.invalidar("a")
+        continuar.set()
+        assert await lectura is None
+        
+        # El None viejo no quedó en la caché negativa
+        async def cargar(clave):
+            return almacenamiento.get(clave)
+        
+        assert await cache.obtener("a", cargar) == {"id": "a"}
+        assert await cache.obtener("a", cargar) == {"id": "a"}
+        assert cache.estadisticas()["aciertos"] == 1
+        
+        # Un cargador que falla no guarda nada
+        async def cargar_con_error(clave):
+            raise RuntimeError("almacenamiento caído")
+        
+        with pytest.raises(RuntimeError):
+            await cache.obtener("b", cargar_con_error)
+        assert await cache.obtener("b", cargar) is None
+        assert cache.estadisticas()["entradas_negativas"] == 1
+    
+    asyncio.run(escenario())
+
+def test_cache_lru_fallos_concurrentes_comparten_carga():
+    """Prueba que los fallos concurrentes de una clave hagan una sola consulta al almacenamiento"""
+    cargas = []
+    
+    async def cargar_lento(clave):
+        cargas.append(clave)
+        await asyncio.sleep(0.01)
+        return {"id": clave}
+    
+    async def escenario():
+        cache = CacheLRU(max_size=2, ttl=60)
+        consultas = [asyncio.ensure_future(cache.obtener("a", cargar_lento)) for _ in range(5)]
+        await asyncio.sleep(0)
+        # Cancelar a quien inició la carga no afecta a las demás consultas
+        consultas[0].cancel()
+        assert await asyncio.gather(*consultas[1:]) == [{"id": "a"}] * 4
+        assert cargas == ["a"]
+        assert cache.estadisticas()["cargas_compartidas"] == 4
+        assert await cache.obtener("a", cargar_lento) == {"id": "a"}
+        assert cargas == ["a"]
+        
+        # Tras invalidar, una consulta nueva no se suma a la carga anterior
+        primera = asyncio.ensure_future(cache.obtener("b", cargar_lento))
+        await asyncio.sleep(0)
+        cache.invalidar("b")
+        segunda = asyncio.ensure_future(cache.obtener("b", cargar_lento))
+        await asyncio.gather(primera, segunda)
+        assert cargas == ["a", "b", "b"]
+    
+    asyncio.run(escenario())
+
+def test_obtener_usuario_usa_cache():
+    """Prueba que las consultas repetidas por ID se sirvan desde la caché"""
+    headers = obtener_headers_auth()
+    aciertos_negativos = usuarios_cache.aciertos_negativos
+    client.get("/api/usuarios/no_existe_cache", headers=headers)
+    response = client.get("/api/usuarios/no_existe_cache", headers=headers)
+    assert response.status_code == 404
+    assert usuarios_cache.aciertos_negativos == aciertos_negativos + 1
+
+def test_admision_rechaza_con_503():
+    """Prueba que el middleware rechace con 503 y Retry-After al saturarse"""
+    async def app_lenta(scope, receive, send):
+        await asyncio.sleep(0.05)
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+    
+    async def escenario():
+        clase = ClaseAdmision("registro", max_en_curso=1, espera_max=0.01, cola_max=1)
+        limitador = LimitadorAdmision({"registro": clase}, lambda metodo, ruta: "registro")
+        middleware = MiddlewareAdmision(app_lenta, limitador)
+        
+        async def solicitud():
+            mensajes = []
+            
+            async def send(mensaje):
+                mensajes.append(mensaje)
+            
+            await middleware({"type": "http", "method": "POST", "path": "/"}, None, send)
+            return mensajes[0]
+        
+        respuestas = await asyncio.gather(solicitud(), solicitud(), solicitud())
+        estados = sorted(r["status"] for r in respuestas)
+        assert estados == [200, 503, 503]
+        rechazada = next(r for r in respuestas if r["status"] == 503)
+        assert (b"retry-after", b"1") in rechazada["headers"]
+        assert clase.en_curso == 0 and clase.en_cola == 0
+        assert clase.rechazadas == 2
+    
+    asyncio.run(escenario())
+
+def test_admision_cede_lugar_en_cola():
+    """Prueba que una solicitud en cola tome el lugar liberado dentro del plazo"""
+    async def escenario():
+        clase = ClaseAdmision("lectura", max_en_curso=1, espera_max=1.0, cola_max=4)
+        assert await clase.adquirir()
+        espera = asyncio.ensure_future(clase.adquirir())
+        await asyncio.sleep(0)
+        assert clase.en_cola == 1
+        clase.liberar(0.01)
+        assert await espera
+        assert clase.en_curso == 1 and clase.en_cola == 0
+    
+    asyncio.run(escenario())
+
+def test_admision_503_con_cabeceras_cors(monkeypatch):
+    """Prueba que los rechazos de admisión pasen por CORS"""
+    async def rechazar():
+        return False
+    
+    monkeypatch.setattr(limitador_admision.clases["registro"], "adquirir", rechazar)
+    response = client.post(
+        "/api/usuarios/registrar",
+        json={"nombre": "Cors Rechazado", "email": "cors503@ejemplo.com", "edad": 30},
+        headers={"Origin": "https://ejemplo.com"}
+    )
+    assert response.status_code == 503
+    assert response.headers["access-control-allow-origin"] == "https://ejemplo.com"
+
+def test_metricas():
+    """Prueba el endpoint de métricas de operación"""
+    assert client.get("/api/metricas").status_code == 401
+    
+    response = client.get("/api/metricas", headers=obtener_headers_auth())
+    assert response.status_code == 200
+    
+    data = response.json()
+    assert "rechazadas" in data["admision"]["registro"]
+    assert "en_cola" in data["admision"]["lectura"]
+    assert "tasa_aciertos" in data["cache_usuarios"]
+
+def test_registro_lote():
+    """Prueba registro por lote con resultados por usuario"""
+    usuarios = [
+        {"nombre": "Lote Uno Pérez", "email": "lote1@ejemplo.com", "edad": 20},
+        {"nombre": "Lote", "email": "lote2@ejemplo.com", "edad": 20},
+        {"nombre": "Lote Tres Pérez", "email": "lote1@ejemplo.com", "edad": 20},
+    ]
+    response = client.post("/api/usuarios/registrar/lote", json=usuarios)
+    assert response.status_code == 200
+    
+    data = response.json()
+    assert [r["estado"] for r in data["resultados"]] == [201, 422, 409]
+    assert data["resultados"][0]["usuario"]["email"] == "lote1@ejemplo.com"
+    assert data["registrados"] == 1 and data["errores"] == 2
+
+def test_hasher_recrea_pool_roto():
+    """Prueba que un worker muerto no deje el pool de hashing roto para siempre"""
+    async def escenario():
+        hasher = PasswordHasher(workers=1, max_pendientes=4)
+        try:
+            # El worker termina abruptamente, como si lo matara el OOM killer
+            with pytest.raises(HasherSaturado):
+                await hasher._ejecutar(os._exit, 1)
+            assert await hasher.verify("Secreta123!", await hasher.hash("Secreta123!"))
+        finally:
+            hasher.shutdown()
+    
+    asyncio.run(escenario())
+
+def test_registro_lote_respeta_capacidad_hashing(monkeypatch):
+    """Prueba que un lote con contraseñas no sature el pool de hashing y cuente cada usuario en la admisión"""
+    monkeypatch.setattr(password_hasher, "max_pendientes", 2)
+    clase_registro = limitador_admision.clases["registro"]
+    admitidas = clase_registro.admitidas
+    
+    usuarios = [
+        {"nombre": "Lote Clave Pérez", "email": f"lote.clave{i}@ejemplo.com", "edad": 30, "password": "Secreta#2024"}
+        for i in range(6)
+    ]
+    response = client.post("/api/usuarios/registrar/lote", json=usuarios)
+    assert response.status_code == 200
+    assert [r["estado"] for r in response.json()["resultados"]] == [201] * 6
+    if settings.ADMISION_ENABLED:
+        assert clase_registro.admitidas - admitidas == 6
+
+def test_cliente_async_agrupa_registros():
+    """Prueba que el cliente asíncrono agrupe registros concurrentes en un lote"""
+    rutas = []
+    
+    class TransporteContador(httpx.AsyncBaseTransport):
+        def __init__(self):
+            self.transporte = httpx.ASGITransport(app=app)
+        
+        async def handle_async_request(self, request):
+            rutas.append(request.url.path)
+            return await self.transporte.handle_async_request(request)
+    
+    async def escenario():
+        async with ClienteAPIAsync("http://api", transport=TransporteContador()) as cliente:
+            resultados = await asyncio.gather(
+                *(cliente.registrar("Cliente Lote", f"cliente.lote{i}@ejemplo.com", 30) for i in range(5)),
+                cliente.registrar("Cliente Lote", "cliente.lote0@ejemplo.com", 30),
+                return_exceptions=True
+            )
+        return resultados
+    
+    resultados = asyncio.run(escenario())
+    assert all(isinstance(r, UserResponse) for r in resultados[:5])
+    assert isinstance(resultados[5], ErrorAPI) and resultados[5].status_code == 409
+    assert rutas == ["/api/usuarios/registrar/lote"]
+
+def test_cliente_async_lote_con_llamador_cancelado():
+    """Prueba que cancelar un registro no haga fallar al resto del lote"""
+    def usuario(datos, i):
+        return {"id": f"u{i}", "fecha_registro": "2024-01-15T10:30:00", **datos}
+    
+    def responder_con(cantidad):
+        async def responder(request):
+            await asyncio.sleep(0.02)
+            datos = json.loads(request.content)[:cantidad]
+            return httpx.Response(200, json={
+                "resultados": [{"estado": 201, "usuario": usuario(d, i)} for i, d in enumerate(datos)],
+                "registrados": len(datos), "errores": 0
+            })
+        return responder
+    
+    async def escenario(cantidad):
+        transporte = httpx.MockTransport(responder_con(cantidad))
+        async with ClienteAPIAsync("http://api", lote_espera=0, transport=transporte) as cliente:
+            tareas = [
+                asyncio.ensure_future(cliente.registrar("Cliente Lote", f"cancelado{i}@ejemplo.com", 30))
+                for i in range(4)
+            ]
+            await asyncio.sleep(0.01)
+            tareas[0].cancel()
+            return await asyncio.gather(*tareas[1:], return_exceptions=True)
+    
+    resultados = asyncio.run(escenario(4))
+    assert [r.email for r in resultados] == [f"cancelado{i}@ejemplo.com" for i in range(1, 4)]
+    
+    # Si el servidor retorna menos resultados, los registros sin resultado fallan en lugar de quedar colgados
+    resultados = asyncio.run(asyncio.wait_for(escenario(2), 1))
+    assert isinstance(resultados[0], UserResponse)
+    assert all(isinstance(r, RuntimeError) for r in resultados[1:])
+
+def test_cliente_sync_reintenta_503():
+    """Prueba que el cliente síncrono reintente ante 503 respetando Retry-After"""
+    intentos = []
+    
+    def responder(request):
+        intentos.append(request)
+        if len(intentos) < 3:
+            return httpx.Response(503, headers={"Retry-After": "0"}, json={
+                "error": "Servicio saturado", "detalle": "", "codigo_error": "HTTP_503", "timestamp": ""
+            })
+        return httpx.Response(200, json={"mensaje": "API de Validación de Usuarios"})
+    
+    with ClienteAPI("http://api", transport=httpx.MockTransport(responder)) as cliente:
+        assert cliente.info()["mensaje"] == "API de Validación de Usuarios"
+    assert len(intentos) == 3
+    
+    with ClienteAPI("http://api", max_reintentos=1, transport=httpx.MockTransport(responder)) as cliente:
+        intentos.clear()
+        with pytest.raises(ErrorAPI) as error:
+            cliente.info()
+        assert error.value.status_code == 503
+        assert error.value.error.codigo_error == "HTTP_503"
+
+def test_cliente_sin_config_del_servidor(tmp_path):
+    """Prueba que el cliente se use fuera del árbol del servidor y con el modelo de lectura"""
+    directorio = os.path.dirname(os.path.abspath(__file__))
+    shutil.copytree(os.path.join(directorio, "cliente_api"), tmp_path / "cliente_api",
+                    ignore=shutil.ignore_patterns("__pycache__"))
+    salida = subprocess.run(
+        [sys.executable, "-c", "import sys; from cliente_api import ClienteAPI, ClienteAPIAsync; "
+                               "print(sorted({'config', 'models'} & set(sys.modules)))"],
+        cwd=tmp_path, capture_output=True, text=True, check=True
+    )
+    assert salida.stdout.strip() == "[]"
+    
+    # La aplicación usa los esquemas del paquete sin cargar los clientes (ni httpx)
+    salida = subprocess.run(
+        [sys.executable, "-c", "import sys, models; print('httpx' in sys.modules)"],
+        cwd=directorio, capture_output=True, text=True, check=True
+    )
+    assert salida.stdout.strip().splitlines()[-1] == "False"
+    
+    usuario = {"id": "u1", "nombre": "Ana Pérez", "email": "ana@ejemplo.com", "edad": 30,
+               "fecha_registro": "2024-01-15T10:30:00"}
+    transporte = httpx.MockTransport(lambda request: httpx.Response(200, json=usuario))
+    with ClienteAPI("http://api", transport=transporte) as cliente:
+        leido = cliente.obtener_usuario("u1")
+    assert leido.nombre == "Ana Pérez" and not hasattr(leido, "mensaje")
+
+def test_openapi_precomputado(tmp_path):
+    """Prueba que el esquema OpenAPI precomputado se cargue completo y que se ignore si no coincide"""
+    esquema = generar_openapi(app)
+    assert client.get("/openapi.json").json() == esquema
+    
+    guardado = tmp_path / "openapi.json"
+    assert guardar_openapi(app, str(guardado)) == esquema
+    assert cargar_openapi(app, str(guardado)) == esquema
+    
+    # Mismo contenido pero otra huella (p. ej. cambió un modelo o una dependencia)
+    contenido = json.loads(guardado.read_text(encoding="utf-8"))
+    contenido[CLAVE_HUELLA] = "otra"
+    guardado.write_text(json.dumps(contenido), encoding="utf-8")
+    assert cargar_openapi(app, str(guardado)) is None
+    assert cargar_openapi(app, str(tmp_path / "inexistente.json")) is None
+
+def test_precalentamiento_y_salud_listo():
+    """Prueba el estado de preparación mientras se ejecutan las tareas de precalentamiento"""
+    response = client.get("/api/salud/listo")
+    assert response.status_code == 200
+    assert response.json()["listo"] is True
+    
+    async def escenario():
+        liberar = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        precalentamiento = Precalentamiento()
+        precalentamiento.registrar("lenta", lambda: asyncio.run_coroutine_threadsafe(liberar.wait(), loop).result())
+        precalentamiento.registrar("fallida", lambda: 1 / 0)
+        precalentamiento.iniciar()
+        await asyncio.sleep(0.05)
+        durante = precalentamiento.estado()
+        liberar.set()
+        while not precalentamiento.listo:
+            await asyncio.sleep(0.01)
+        return durante, precalentamiento.estado()
+    
+    durante, despues = asyncio.run(escenario())
+    assert durante["listo"] is False
+    assert durante["tareas"]["lenta"]["estado"] == "pendiente"
+    assert despues["listo"] is True
+    assert despues["tareas"]["lenta"]["estado"] == "completada"
+    assert despues["tareas"]["fallida"]["estado"] == "fallida"
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])